@@ -9,18 +9,38 @@
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 import base64
-from io import BytesIO
-from PIL import Image, ImageQt
 from const import *
+from board_model import boardModel
+from fretboard_widget import FretboardWidget
+
+DOT_IMAGE = b'iVBORw0KGgoAAAANSUhEUgAAAEoAAABKCAYAAAFr1/LnAAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAAFxEAABcRAcom8z8AAA8sSURBVGhD7ZsNcF1FFcebpPn+/v5omrZpSdJ8NWnSGtKkGUyofFhqtI1iCyJ2MhSoCqg4jtJRBCljmREVrOMMjKAMo9gyiCgNaKcwMGp1CijSOraUlkJLA63QNknJ8/e/725y8959yXsvLynBnJn/7N69u2fPnt09e3b33hlhUXV19aaampp+Yf78+Y/bySOJl56qqio/2K+9VFxcfN2CBQs8voCrJy0t7YydzcrYO3v2bI8bCgsLh7lmZGT05ufne9yQl5c3nBH230pPT/f4AgbKNODNZdPMmTM9SUlJIxAfHz+yMQ76O9BL4W0lTALNmzfvb+qRioqKAVBtJ3upra2tWor17Q0UfZ2dZcaM8847z68nHIi3Mrn1gDBnzhxPVlbWlVYmN+0bpKamejNJ0249ABfpLcHK1N7efpGv5hMSEjz0yBNWBkPLli2rIjgNjOZvAxEkxmAiekygpRbs5OCotra2pby8/ICmBXE/LFq0yOqQysrK4Q5xoejS0tKDZPLQxQHBBPWUlZVZ8blz53qKioquscsPExNgJ2PGEypo+iBTbrHNxku5ubnWtKOmkKC5S1nvgDBE3x7R4MjJyQkKygsTT3Z2ticlJWW1zWaIMoEnOTk5KGgEMkQ10B7wFnehzMzMHxBYBRITEy2Y0SlbERUV5YmLi9MgHDlKgyCNqyUONIBzTBrtGvmCZoGdHDwtXLiQwV31WwblgFk5GMT9DM49dXV137WzjUpRLS0tt2iKuE0fQaOeEX94yFS50eLFi58PtDT5AkZvUCTaW9JB6ODzmlcyjM5554TmqJYx5aH5ir9O0RgvB4gMcYyXd5UhFMhK0yE32WwsaarBoNtkDQQYeLAkHgby8zYby7R3qVm+pn0slJSUaB6egEWUxYiHLrfZHgyYzMOMmF9dWrV915BgwCQeZsTDx7WuyEw4TUcgKB+6sUwLE/rYECNIg6vPd9EaDVhaixH4npfFMP3M2B1lMnE3yLRg3CxTQ5hjlx8mBtlrxg7JNzH2yBeyS7Y/425amOUFzc3NL8fGxpqVdKiwKoiJifFER0ebd0HZp1uBHKEhhjbk4b0IFoGQSMuP00omg2kam5qamhKxwjn4G0uxcd/GaG7GEm3GgFowz7z7DnmWKS+zKeLq1WyKYsheTYV/xqT1y+DKCXJadDcoj0wg1ussZf4KD/k2/kY6FILhJTiQuxHmlIy1lpJwoEYItsF/A74bsdmBl6MAFE0XXNfY2PgOLqNl9J3MQ4VWIhOX5sQPM3+YdWADdc30VjkKsbjMws4/pgXDrEAKw4HKyjUN9E4LE3XtQMA5dvX+ROb4goKCOxBMG1BrJYs0DF+tloqzDA3MmjXrbjzWJFuMkYRAq1k6jms1dC61kYb4SzCFWq2p8x2WqysQYWiJGiJedvGyF8ktXxuNjVhtlT7as4FvOcGZV3FB+VQP9Z6wd4P+QrGwWkKhMdeVeyIgL0KuxahCgbe1iVDmYD2FUOHkq7pY20/inXwOEfyFQto09hJbydDv61WIgVwa3/RQYQSRA6I4dZ2l6p/znOWVwp8kaTtOxCtyNFTQjfF4IN9Lodwm1YEv8h/8j0vsugNTZ2fnIlT6mO3hTAjkACUkJDyBM9RoVzs2sW5lYNjuxgr3iYEENL4dr0f4eYFg8gg6BLGPoARtM0duyUOhtWvXpl1wwQXNMH6Ux/eBxViVSlDz7AYjhAQiVFkJE/Ftq/bFTeAzQG70K+BAAOwF3wefBS0gtLOaafq/I23GWbus8z0ndPKhdL23s048UVkW5mIWpmID8Ttx/iy/HPfX6aMr/fqamhrkKw5oqcdNVJiHICuo7Bc4bjtwPU7ybB3hOKE0hJI/9i5uSQ/xhyhzKWGBzSoiFIUQFVT2IIz3yz02mwKFowFhLL8J3/xVyj9M2RqbZ/jU0NCQg59+NRVsh6l18hOMME4ovxqCFhVuQ0CdZIdHUjcM7mppaTmJMO9LKLU8VKicAX75IC73NrzP0DW2evVqzZ5NCDQgP1pbI55HVBAutJFAuO0hC8a0Xtja2vq0/Gcxkvp9mQcLNcY0SN2vXYz4ItR2GhxcV+I7F1PgIQQ7q62QGKp1Yhgq1H0qK23rWQIplOblo1PPI2we5tlVByaEuRwcde7PTDxU2F3l+k6CItBx3KOr7KrdCUd+HtghN3U8wowFCST+2smAnexwymwR/ImXdWTapz5XQdmYSEN86TYLOnGlzv3snnTw5U+0IJ5+/jqO/HsqbApGGgwNSzjFJSCbkdMIdgsi+PtbbKnykfgP2v5MpFBm963eELSVo3f+xA6nyBZlmCQUmXo0K5RZqp1IqA7VJSUg0K6AQqHKHg0+ZRa0xTbQFtv5HCjNt5zgzGfiCoMSCuqx1WnBMJooSChtcJntgYVi89mjzNrjTwZ0ZqFNqYRi/+cvFFuo/JSUlB7ZKDcGEwUJhTICC4W2nsIkWP2sbpSAkYaTr+rRhQXb+GcQapYtyjDpFgM8rA2mCtDHQ4UjBXNAorj4C7rXQCHbpRRblJHErvdj0dHRB6RScyAh2INxRFo40OGGtKO46pBQ1HcILa20RfCnuLi4cgR7UdL7ChZpSCBdE6Ghl8HIT0l8KAVsIXM/GV2ZjQdqqGmsxi6NH0hISPgRPZHmrT4wfRTs16GEBBN0mCFG5jlcSBB7YFvP1HEI3hd7qx2Furu7Y1koN8bExByjry2BIg3xjYqK6iX+FaoM7uZh1apVGU1NTQ/IjvBotcrJMBxhNX4E+3joOGlfJXQ/Ow9ErOQrcTNekjPGox9z0yUm3QmT7swjYezzrDfBjSD0jxlES5cuXYW2drJGneTRqkDMBX38oftRX8H0rHTFVUZwxN8CN4BYED6tXLlyAa7GDQihFuozNsvgOSsNBAkvrRLXCfBxoC6LzOHZli1bEhFE59z3g6NA1/N+QrhA+ZT/QfAFIJMTUdIVmE5QPgG6wR/Bq8DtaPEg2AV06dgJdBE/vi4LkrQDcd54O7EUVIBpmqZpmqbA1NDQEFteXj5Xh4zV1dW1BvX19X5wvjeoqKiorqmpKdUhg81ySlOMrZDUysrKuqqqqhVgJfG1NPQWlPQE8RfAv2n0PhSwl/d7ibvCfr9P+cGLYAd8bi0rK7sCx+8y4itAQ2lpabrqXbNmzfD3gB9EUi/TiAVgDY27GdyDsp6jEYdo6DEU1Mvzezxb558oYehIezQoj/IK8LSOJuFzCj+vF0W9Rb2H4fkXeP4UfIP6LydfRXE4H59OFK1bty65o6OjBIEX04BraMzDCPsaDemjAboNGVJIJGEUKMUJqkf1obA+0o9Q5zbSNyJHjUaZLe7kEwJlI9BFhJuxJ0+2t7fvIVQPWz0+EcoJBClKI1QwSpMcKO4IaY8yRa9lt6FrhPF9ShYKtbW1paAc3a3diWJ2Nzc3nz7//POts2dBQhqhzyWkMHWYFAb0hfU2cC3xqgkfYVQgY3nh8uXL72eTelDDH6VZCpJQigvnQllSjNvIYupZ8mHoB0tKSo4QbiNtI2E1+9mIf44QQ29UUmE3+BXDWBVavSUF2fbBEspX4MmA6lX9psOUpusgpTvzSU4dRufm5r6J/Lo8u579dS3tG//dO1rPgHkb+AnxfUYghYJRlNKkOJM+UTB1GIUYpfjmGw2SVaA9B2jXfez7VxCG/y2AhiZMWouKim7Pycl5qbCw8IxGklvl5wLhdozK6e6FdvXl5+fvZVRtYVq2Ew/rw+b47OzscjT9TbCHeJ9uIJyVTRUYeXVjZkyG0tSezMzMs4T/RFG3o6iqkO0W0ymFwh3Jycn3pKam7odBv5irsqkIoyCFelbcvtE7m5eXd5AZcx/xi2lnhq2CsYkppu/rL0XTv8zKyjqsuwGYWIx9BZgK0P2r4ExTW8wo09UCbTxKex8pKCj4FINDlzCjf9Qp0mUfhT6NfXoapb2tizijJDQ+5aD7YEFxoyQ9S3kKdZXGSniSwfEs4VUMDl2hBacoqAvourZXV7WmMo0shdgtK655rtAZN+/17Hxv8gh6b/j55jEINq9Jc9brlm7iRkFKU9t0k8bUO8HI2oWSriTUBWhwiqJgF+hBWdY38qpUTHmelDvuyUJEFAWDHtCroSmGTkV9GCBFmfv99PT0E7Q5dEVh0LqSkpJ6KDipPzhMJtQuDQL7K/0TKGwXuDLR++3B2IqS1deIglEP2u2VxgktpqYSxckzJWBk9k3XlFO7dF1Mm0+grF24QqEpisJrKPgko0rXutZnCPZc/tDAKIr26qrynbS0tJ0hKYrVIJGC9WBTVFTUc+AMo2pQytJFvYaqKtCzE0ozQri9PxeQrJoRCn3TJSPhYHR0dD/N3o2CbkNRTYy+kLYy8VIW2t5MuC82NrZfd/xSVCAYgYxwbnkmG77yKG46kXbpqn+Adu0n/kPCj9Du0L4/gHT0MB98Eehe+JRuyFXhB0UJY0FK0ej2lde0wf5Ao4/wWUzNzYymcp7Dvt2ZzdBch7Z/h/b137z1SYEMoP4Tc4MRyO3dZMPI4VSSZNc3HbRH9vcpsB5llXqbGz7NhMk8KtiQkJCwDaUdAe+bbzVsQ2hBU1OhBBFM+rmAZJFsjBLr2cT1oZVk5/0x0h4HXyZdHy1E5nh469atsXV1dYsqKytvbGxs3MV+6b8kW9+I6JMeo6RAcCp0oqG6fCEF0cGS9Shx/Tx4A3n1z17kL1K7u7uTlixZUscI+y4bzN2tra2Dctp4NdSDbkLbtmDo2yrfPJGERovqcoG+PNI/hPo+qwFM/BXW+vXri0tLSzvpmXtra2tfqq+vP83UPEOPDfLaUogZYb6KUpp6V2kKnY0cC8pv+Dp5OHnpvclnK60XSEFfA1LQ5F6Kejye6M7OzkKW2QvZjW/s6OjYTPh7jOTrei1jKUEF/eqqNDVIipPCNA2UpnfKo+kbCOa9k694mDTx0LPSDV+gz8WkIH0DqSkW8rIfUdq0aVO07vp1V9bS0lJbVla2gQb8mld7wCGgD+6GGumESQ8HTh52XKNZnfQC0K++XwIaQZP3d2OIJNdfW4B6cBm4A/wGPAWeAf8Ap4AaJiWGCpXrA/8CzwL5eNvBFvBJIOUUg8m7FY4Q6SvJXKC/L/Wv13JwE1DD7gX3gB8HAeVT/rvAzaAdyPcpBOKfCj50pCVZ+6lwMf3D+TRNaZox43+sWLVJcZ4iIwAAAABJRU5ErkJggg=='
+_dot_pixmaps = dict()
+
+def dotPixmap(color = None):
+    '''
+        The pixmap of press points, tinted if color is given, decoded once and shared by every point and window.
+    '''
+    if color not in _dot_pixmaps:
+        pixmap = QtGui.QPixmap()
+        pixmap.loadFromData(base64.b64decode(DOT_IMAGE), 'PNG')
+        if color is not None:       # Keep the shape of the dot, fill it with color
+            painter = QtGui.QPainter(pixmap)
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceIn)
+            painter.fillRect(pixmap.rect(), QtGui.QColor(color))
+            painter.end()
+        _dot_pixmaps[color] = pixmap
+    return _dot_pixmaps[color]
 
 class Fretboard_ui(object):
-    def __init__(self, MainWindow):
+    def __init__(self, MainWindow, painted = False, tuning = None):
         MainWindow.setObjectName("MainWindow")
         MainWindow.setEnabled(True)
         MainWindow.resize(*WINDOW_SIZE)
         MainWindow.setWindowTitle("ThreeNotes")
         self.centralwidget = QtWidgets.QWidget(MainWindow)
         self.centralwidget.setObjectName("centralwidget")
+        ## Geometry and notes shared by every board of the tuning
+        self.model = boardModel(tuning)
 
         ###############################################################
         ######################## Note Textbox ########################
@@ -33,28 +53,15 @@ class Fretboard_ui(object):
             var.setObjectName(f'textBrowser_{i + 1}')
             vars(self)[f'textBrowser_{i + 1}'] = var
 
-        ###############################################################
-        ######################## Horizon Lines ########################
-        ###############################################################
-
-        _class = ConstHorizonLine
-        for stringIdx in range(STRING_NUM):
-            X = _class.startX - _class.stepX_1
-            Y = _class.startY + _class.stepY * stringIdx
-            for noteIdx in range(NOTE_PER_STRING):
-                if noteIdx < 5:
-                    X += _class.stepX_1
-                    width = _class.width_1
-                elif noteIdx < 9:
-                    X += _class.stepX_2
-                    width = _class.width_2
-                else:
-                    X += _class.stepX_3
-                    width = _class.width_3
+        if not painted:     # The painted fretboard draws the lines itself
+            ###############################################################
+            ######################## Horizon Lines ########################
+            ###############################################################
 
+            for idx, rect in enumerate(self.model.horizon_rects):
                 var = QtWidgets.QFrame(self.centralwidget)
                 var.setEnabled(True)
-                var.setGeometry(QtCore.QRect(X, Y, width, _class.height))
+                var.setGeometry(rect)
                 font = QtGui.QFont()
                 font.setBold(False)
                 font.setWeight(50)
@@ -63,28 +70,17 @@ class Fretboard_ui(object):
                 var.setMouseTracking(False)
                 var.setFrameShape(QtWidgets.QFrame.HLine)
                 var.setFrameShadow(QtWidgets.QFrame.Sunken)
-                var.setObjectName(f'line_{stringIdx * NOTE_PER_STRING + noteIdx + HORIZON_LINES_INDEX_START}')
-                vars(self)[f'line_{stringIdx * NOTE_PER_STRING + noteIdx + HORIZON_LINES_INDEX_START}'] = var
+                var.setObjectName(f'line_{idx + HORIZON_LINES_INDEX_START}')
+                vars(self)[f'line_{idx + HORIZON_LINES_INDEX_START}'] = var
 
-        ################################################################
-        ######################## Vertical Lines ########################
-        ################################################################
-
-        _class = ConstVerticalLine
-        for stringIdx in range(STRING_NUM - 1):
-            X = _class.startX - _class.stepX_1
-            Y = _class.startY + _class.stepY * stringIdx
-            for noteIdx in range(NOTE_PER_STRING + 1):
-                if noteIdx < 5:
-                    X += _class.stepX_1
-                elif noteIdx < 9:
-                    X += _class.stepX_2
-                else:
-                    X += _class.stepX_3
+            ################################################################
+            ######################## Vertical Lines ########################
+            ################################################################
 
+            for idx, rect in enumerate(self.model.vertical_rects):
                 var = QtWidgets.QFrame(self.centralwidget)
                 var.setEnabled(True)
-                var.setGeometry(QtCore.QRect(X, Y, _class.width, _class.height))
+                var.setGeometry(rect)
                 font = QtGui.QFont()
                 font.setBold(False)
                 font.setWeight(50)
@@ -93,53 +89,28 @@ class Fretboard_ui(object):
                 var.setMouseTracking(False)
                 var.setFrameShape(QtWidgets.QFrame.VLine)
                 var.setFrameShadow(QtWidgets.QFrame.Sunken)
-                var.setObjectName(f'line_{stringIdx * (NOTE_PER_STRING + 1) + noteIdx + VERTICAL_LINES_INDEX_START}')
-                vars(self)[f'line_{stringIdx * (NOTE_PER_STRING + 1) + noteIdx + VERTICAL_LINES_INDEX_START}'] = var
+                var.setObjectName(f'line_{idx + VERTICAL_LINES_INDEX_START}')
+                vars(self)[f'line_{idx + VERTICAL_LINES_INDEX_START}'] = var
 
         ##############################################################
         ######################## Press Points ########################
         ##############################################################
 
-        dot_image = b'iVBORw0KGgoAAAANSUhEUgAAAEoAAABKCAYAAAFr1/LnAAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAAFxEAABcRAcom8z8AAA8sSURBVGhD7ZsNcF1FFcebpPn+/v5omrZpSdJ8NWnSGtKkGUyofFhqtI1iCyJ2MhSoCqg4jtJRBCljmREVrOMMjKAMo9gyiCgNaKcwMGp1CijSOraUlkJLA63QNknJ8/e/725y8959yXsvLynBnJn/7N69u2fPnt09e3b33hlhUXV19aaampp+Yf78+Y/bySOJl56qqio/2K+9VFxcfN2CBQs8voCrJy0t7YydzcrYO3v2bI8bCgsLh7lmZGT05ufne9yQl5c3nBH230pPT/f4AgbKNODNZdPMmTM9SUlJIxAfHz+yMQ76O9BL4W0lTALNmzfvb+qRioqKAVBtJ3upra2tWor17Q0UfZ2dZcaM8847z68nHIi3Mrn1gDBnzhxPVlbWlVYmN+0bpKamejNJ0249ABfpLcHK1N7efpGv5hMSEjz0yBNWBkPLli2rIjgNjOZvAxEkxmAiekygpRbs5OCotra2pby8/ICmBXE/LFq0yOqQysrK4Q5xoejS0tKDZPLQxQHBBPWUlZVZ8blz53qKioquscsPExNgJ2PGEypo+iBTbrHNxku5ubnWtKOmkKC5S1nvgDBE3x7R4MjJyQkKygsTT3Z2ticlJWW1zWaIMoEnOTk5KGgEMkQ10B7wFnehzMzMHxBYBRITEy2Y0SlbERUV5YmLi9MgHDlKgyCNqyUONIBzTBrtGvmCZoGdHDwtXLiQwV31WwblgFk5GMT9DM49dXV137WzjUpRLS0tt2iKuE0fQaOeEX94yFS50eLFi58PtDT5AkZvUCTaW9JB6ODzmlcyjM5554TmqJYx5aH5ir9O0RgvB4gMcYyXd5UhFMhK0yE32WwsaarBoNtkDQQYeLAkHgby8zYby7R3qVm+pn0slJSUaB6egEWUxYiHLrfZHgyYzMOMmF9dWrV915BgwCQeZsTDx7WuyEw4TUcgKB+6sUwLE/rYECNIg6vPd9EaDVhaixH4npfFMP3M2B1lMnE3yLRg3CxTQ5hjlx8mBtlrxg7JNzH2yBeyS7Y/425amOUFzc3NL8fGxpqVdKiwKoiJifFER0ebd0HZp1uBHKEhhjbk4b0IFoGQSMuP00omg2kam5qamhKxwjn4G0uxcd/GaG7GEm3GgFowz7z7DnmWKS+zKeLq1WyKYsheTYV/xqT1y+DKCXJadDcoj0wg1ussZf4KD/k2/kY6FILhJTiQuxHmlIy1lpJwoEYItsF/A74bsdmBl6MAFE0XXNfY2PgOLqNl9J3MQ4VWIhOX5sQPM3+YdWADdc30VjkKsbjMws4/pgXDrEAKw4HKyjUN9E4LE3XtQMA5dvX+ROb4goKCOxBMG1BrJYs0DF+tloqzDA3MmjXrbjzWJFuMkYRAq1k6jms1dC61kYb4SzCFWq2p8x2WqysQYWiJGiJedvGyF8ktXxuNjVhtlT7as4FvOcGZV3FB+VQP9Z6wd4P+QrGwWkKhMdeVeyIgL0KuxahCgbe1iVDmYD2FUOHkq7pY20/inXwOEfyFQto09hJbydDv61WIgVwa3/RQYQSRA6I4dZ2l6p/znOWVwp8kaTtOxCtyNFTQjfF4IN9Lodwm1YEv8h/8j0vsugNTZ2fnIlT6mO3hTAjkACUkJDyBM9RoVzs2sW5lYNjuxgr3iYEENL4dr0f4eYFg8gg6BLGPoARtM0duyUOhtWvXpl1wwQXNMH6Ux/eBxViVSlDz7AYjhAQiVFkJE/Ftq/bFTeAzQG70K+BAAOwF3wefBS0gtLOaafq/I23GWbus8z0ndPKhdL23s048UVkW5mIWpmID8Ttx/iy/HPfX6aMr/fqamhrkKw5oqcdNVJiHICuo7Bc4bjtwPU7ybB3hOKE0hJI/9i5uSQ/xhyhzKWGBzSoiFIUQFVT2IIz3yz02mwKFowFhLL8J3/xVyj9M2RqbZ/jU0NCQg59+NRVsh6l18hOMME4ovxqCFhVuQ0CdZIdHUjcM7mppaTmJMO9LKLU8VKicAX75IC73NrzP0DW2evVqzZ5NCDQgP1pbI55HVBAutJFAuO0hC8a0Xtja2vq0/Gcxkvp9mQcLNcY0SN2vXYz4ItR2GhxcV+I7F1PgIQQ7q62QGKp1Yhgq1H0qK23rWQIplOblo1PPI2we5tlVByaEuRwcde7PTDxU2F3l+k6CItBx3KOr7KrdCUd+HtghN3U8wowFCST+2smAnexwymwR/ImXdWTapz5XQdmYSEN86TYLOnGlzv3snnTw5U+0IJ5+/jqO/HsqbApGGgwNSzjFJSCbkdMIdgsi+PtbbKnykfgP2v5MpFBm963eELSVo3f+xA6nyBZlmCQUmXo0K5RZqp1IqA7VJSUg0K6AQqHKHg0+ZRa0xTbQFtv5HCjNt5zgzGfiCoMSCuqx1WnBMJooSChtcJntgYVi89mjzNrjTwZ0ZqFNqYRi/+cvFFuo/JSUlB7ZKDcGEwUJhTICC4W2nsIkWP2sbpSAkYaTr+rRhQXb+GcQapYtyjDpFgM8rA2mCtDHQ4UjBXNAorj4C7rXQCHbpRRblJHErvdj0dHRB6RScyAh2INxRFo40OGGtKO46pBQ1HcILa20RfCnuLi4cgR7UdL7ChZpSCBdE6Ghl8HIT0l8KAVsIXM/GV2ZjQdqqGmsxi6NH0hISPgRPZHmrT4wfRTs16GEBBN0mCFG5jlcSBB7YFvP1HEI3hd7qx2Furu7Y1koN8bExByjry2BIg3xjYqK6iX+FaoM7uZh1apVGU1NTQ/IjvBotcrJMBxhNX4E+3joOGlfJXQ/Ow9ErOQrcTNekjPGox9z0yUm3QmT7swjYezzrDfBjSD0jxlES5cuXYW2drJGneTRqkDMBX38oftRX8H0rHTFVUZwxN8CN4BYED6tXLlyAa7GDQihFuozNsvgOSsNBAkvrRLXCfBxoC6LzOHZli1bEhFE59z3g6NA1/N+QrhA+ZT/QfAFIJMTUdIVmE5QPgG6wR/Bq8DtaPEg2AV06dgJdBE/vi4LkrQDcd54O7EUVIBpmqZpmqbA1NDQEFteXj5Xh4zV1dW1BvX19X5wvjeoqKiorqmpKdUhg81ySlOMrZDUysrKuqqqqhVgJfG1NPQWlPQE8RfAv2n0PhSwl/d7ibvCfr9P+cGLYAd8bi0rK7sCx+8y4itAQ2lpabrqXbNmzfD3gB9EUi/TiAVgDY27GdyDsp6jEYdo6DEU1Mvzezxb558oYehIezQoj/IK8LSOJuFzCj+vF0W9Rb2H4fkXeP4UfIP6LydfRXE4H59OFK1bty65o6OjBIEX04BraMzDCPsaDemjAboNGVJIJGEUKMUJqkf1obA+0o9Q5zbSNyJHjUaZLe7kEwJlI9BFhJuxJ0+2t7fvIVQPWz0+EcoJBClKI1QwSpMcKO4IaY8yRa9lt6FrhPF9ShYKtbW1paAc3a3diWJ2Nzc3nz7//POts2dBQhqhzyWkMHWYFAb0hfU2cC3xqgkfYVQgY3nh8uXL72eTelDDH6VZCpJQigvnQllSjNvIYupZ8mHoB0tKSo4QbiNtI2E1+9mIf44QQ29UUmE3+BXDWBVavSUF2fbBEspX4MmA6lX9psOUpusgpTvzSU4dRufm5r6J/Lo8u579dS3tG//dO1rPgHkb+AnxfUYghYJRlNKkOJM+UTB1GIUYpfjmGw2SVaA9B2jXfez7VxCG/y2AhiZMWouKim7Pycl5qbCw8IxGklvl5wLhdozK6e6FdvXl5+fvZVRtYVq2Ew/rw+b47OzscjT9TbCHeJ9uIJyVTRUYeXVjZkyG0tSezMzMs4T/RFG3o6iqkO0W0ymFwh3Jycn3pKam7odBv5irsqkIoyCFelbcvtE7m5eXd5AZcx/xi2lnhq2CsYkppu/rL0XTv8zKyjqsuwGYWIx9BZgK0P2r4ExTW8wo09UCbTxKex8pKCj4FINDlzCjf9Qp0mUfhT6NfXoapb2tizijJDQ+5aD7YEFxoyQ9S3kKdZXGSniSwfEs4VUMDl2hBacoqAvourZXV7WmMo0shdgtK655rtAZN+/17Hxv8gh6b/j55jEINq9Jc9brlm7iRkFKU9t0k8bUO8HI2oWSriTUBWhwiqJgF+hBWdY38qpUTHmelDvuyUJEFAWDHtCroSmGTkV9GCBFmfv99PT0E7Q5dEVh0LqSkpJ6KDipPzhMJtQuDQL7K/0TKGwXuDLR++3B2IqS1deIglEP2u2VxgktpqYSxckzJWBk9k3XlFO7dF1Mm0+grF24QqEpisJrKPgko0rXutZnCPZc/tDAKIr26qrynbS0tJ0hKYrVIJGC9WBTVFTUc+AMo2pQytJFvYaqKtCzE0ozQri9PxeQrJoRCn3TJSPhYHR0dD/N3o2CbkNRTYy+kLYy8VIW2t5MuC82NrZfd/xSVCAYgYxwbnkmG77yKG46kXbpqn+Adu0n/kPCj9Du0L4/gHT0MB98Eehe+JRuyFXhB0UJY0FK0ej2lde0wf5Ao4/wWUzNzYymcp7Dvt2ZzdBch7Z/h/b137z1SYEMoP4Tc4MRyO3dZMPI4VSSZNc3HbRH9vcpsB5llXqbGz7NhMk8KtiQkJCwDaUdAe+bbzVsQ2hBU1OhBBFM+rmAZJFsjBLr2cT1oZVk5/0x0h4HXyZdHy1E5nh469atsXV1dYsqKytvbGxs3MV+6b8kW9+I6JMeo6RAcCp0oqG6fCEF0cGS9Shx/Tx4A3n1z17kL1K7u7uTlixZUscI+y4bzN2tra2Dctp4NdSDbkLbtmDo2yrfPJGERovqcoG+PNI/hPo+qwFM/BXW+vXri0tLSzvpmXtra2tfqq+vP83UPEOPDfLaUogZYb6KUpp6V2kKnY0cC8pv+Dp5OHnpvclnK60XSEFfA1LQ5F6Kejye6M7OzkKW2QvZjW/s6OjYTPh7jOTrei1jKUEF/eqqNDVIipPCNA2UpnfKo+kbCOa9k694mDTx0LPSDV+gz8WkIH0DqSkW8rIfUdq0aVO07vp1V9bS0lJbVla2gQb8mld7wCGgD+6GGumESQ8HTh52XKNZnfQC0K++XwIaQZP3d2OIJNdfW4B6cBm4A/wGPAWeAf8Ap4AaJiWGCpXrA/8CzwL5eNvBFvBJIOUUg8m7FY4Q6SvJXKC/L/Wv13JwE1DD7gX3gB8HAeVT/rvAzaAdyPcpBOKfCj50pCVZ+6lwMf3D+TRNaZox43+sWLVJcZ4iIwAAAABJRU5ErkJggg=='
-        byte_data = base64.b64decode(dot_image)
-        image_data = BytesIO(byte_data)
-        image = Image.open(image_data)
-        image = ImageQt.ImageQt(image)
-
-        _class = ConstPressPoint
-        for stringIdx in range(STRING_NUM):
-            X = _class.startX - _class.stepX_1
-            Y = _class.startY + _class.stepY * stringIdx
-            note = NOTES.index(OPEN_STRING_NOTE[stringIdx + 1]['noteName'])
-            pitch = OPEN_STRING_NOTE[stringIdx + 1]['pitchNum']
-            for noteIdx in range(NOTE_PER_STRING):
-                if noteIdx < 4:
-                    X += _class.stepX_1
-                elif noteIdx == 4:
-                    X += _class.stepX_2
-                elif noteIdx < 8:
-                    X += _class.stepX_3
-                elif noteIdx == 8:
-                    X += _class.stepX_4
-                else:
-                    X += _class.stepX_5
-
-                # update note and pitch
-                if note + 1 < len(NOTES):
-                    note += 1
-                else:
-                    note = 0
-                    pitch += 1
-
+        if painted:
+            ## The whole board is drawn by one widget
+            self.fretboard = FretboardWidget(self.centralwidget, self.model, dotPixmap())
+            self.fretboard.setObjectName('fretboard')
+        else:
+            self.fretboard = None
+            for idx, (rect, pitch) in enumerate(zip(self.model.point_rects, self.model.point_pitches)):
                 var = QtWidgets.QLabel(self.centralwidget)
                 var.setEnabled(True)
-                var.setGeometry(QtCore.QRect(X, Y, _class.width, _class.height))
-                var.setPixmap(QtGui.QPixmap.fromImage(image))
+                var.setGeometry(rect)
+                var.setPixmap(dotPixmap())     # Implicitly shared, not copied
                 var.setScaledContents(True)
-                var.setObjectName(f'label_{stringIdx * NOTE_PER_STRING + noteIdx + HORIZON_LINES_INDEX_START}')
-                var.noteName = NOTES[note]
-                var.pitchNum = pitch
-                vars(self)[f'label_{stringIdx * NOTE_PER_STRING + noteIdx + HORIZON_LINES_INDEX_START}'] = var
+                var.setObjectName(f'label_{idx + POINTS_INDEX_START}')
+                var.pitch = pitch
+                vars(self)[f'label_{idx + POINTS_INDEX_START}'] = var
 
         #############################################################
         ######################## Fret Number ########################
@@ -300,4 +271,9 @@ class Fretboard_ui(object):
         self.modeButton = QtWidgets.QPushButton(self.centralwidget)
         self.modeButton.setGeometry(QtCore.QRect(1030, 85, 71, 31))
         self.modeButton.setText("Chord Mode")
-        self.modeButton.setObjectName("modeButton")
\ No newline at end of file
+        self.modeButton.setObjectName("modeButton")
+        self.noteQuery = QtWidgets.QLineEdit(self.centralwidget)
+        self.noteQuery.setGeometry(QtCore.QRect(880, 85, 141, 31))
+        self.noteQuery.setPlaceholderText("C E G / C#4 / A+7")
+        self.noteQuery.setObjectName("noteQuery")
+        self.noteQuery.hide()
\ No newline at end of file
@@ -1,24 +1,63 @@
+import time
+_import_start = time.perf_counter()
+from contextlib import contextmanager
 from PyQt5 import QtCore, QtGui, QtWidgets
-from pychord import find_chords_from_notes
-from pychord.analyzer import notes_to_positions
 import Fretboard_ui
+from chord_table import getChordTable
+from text_cache import DocumentCache, richText
+from fretboard_state import FretboardState
+from note_index import maskBits
+from pitch import OCTAVE, spellPitch, voicingPitches
+from chord_formula import getChordFormulaTable
+from chord_ranking import rankPitches
+from scales import SCALES, SCALE_NAMES, degreeName, degreeNumber, parseScale
+from session_log import SessionRecorder, POINT, MUTE, RESET, MODE, UNDO, REDO
+from instrumentation import tracer, traced
 from const import *
+_import_end = time.perf_counter()
 
 class ThreeNotes(Fretboard_ui.Fretboard_ui): # Inherit from Fretboard_ui.py
-    def __init__(self, MainWindow):
-        super().__init__(MainWindow)
+    def __init__(self, MainWindow, painted = False, background = False, ranked = False, tuning = None):
+        super().__init__(MainWindow, painted, tuning)
+        ## The fret pressed and the mute of each string now playing
+        self.state = FretboardState()
+        ## The state shown by the widgets
+        self.rendered = self.state.snapshot()
         # Get objects define in Fretboard_ui.py
-        ## The notes now playing
-        self.component_notes = {stringNum: val['noteName'] for stringNum, val in OPEN_STRING_NOTE.items()}
-        ## The strings now muted
-        self.string_muted = {i:False for i in range(1, STRING_NUM + 1)}
-        self.Horizon_lines = [vars(self)[f'line_{i}'] for i in range(HORIZON_LINES_INDEX_START, HORIZON_LINES_INDEX_END + 1)]
-        self.Vertical_lines = [vars(self)[f'line_{i}'] for i in range(VERTICAL_LINES_INDEX_START, VERTICAL_LINES_INDEX_END + 1)]
-        self.points = [vars(self)[f'label_{i}'] for i in range(POINTS_INDEX_START, POINTS_INDEX_END + 1)]
+        if self.fretboard:      # Painted by one widget
+            self.Horizon_lines = self.fretboard.horizon_lines
+            self.Vertical_lines = self.fretboard.vertical_lines
+            self.points = self.fretboard.points
+        else:
+            self.Horizon_lines = [vars(self)[f'line_{i}'] for i in range(HORIZON_LINES_INDEX_START, HORIZON_LINES_INDEX_END + 1)]
+            self.Vertical_lines = [vars(self)[f'line_{i}'] for i in range(VERTICAL_LINES_INDEX_START, VERTICAL_LINES_INDEX_END + 1)]
+            self.points = [vars(self)[f'label_{i}'] for i in range(POINTS_INDEX_START, POINTS_INDEX_END + 1)]
+        self.point_numbers = {point: idx for idx, point in enumerate(self.points)}
         self.initLinkLinesAndPoints(self.Horizon_lines, self.points)
         self.strings = self.initString(self.Horizon_lines)
         self.textBrowsers = [vars(self)[f'textBrowser_{i}'] for i in range(1, STRING_NUM + 1)]
         self.checkBoxs = [vars(self)[f'checkBox_{i}'] for i in range(1, STRING_NUM + 1)]
+        ## Parsed note names of each string (open string and every fret), and recent chord names
+        self.note_name_caches = [DocumentCache(textBrowser, NOTE_PER_STRING + 1) for textBrowser in self.textBrowsers]
+        self.chord_text_cache = DocumentCache(self.textBrowser_chord_identifier, CHORD_TEXT_CACHE_SIZE)
+
+        ## Chord name of every pitch-class set, built on the first chord evaluation
+        self.chord_table = None
+        ## Chord name now shown
+        self.chord_name = ''
+        ## Show the best ranked interpretation instead of the lowest pitch as root if ranked
+        self.ranked = ranked
+        ## Identify chords off the GUI thread if background
+        self.chord_worker = None
+        if background:
+            from chord_worker import ChordWorker
+            self.chord_worker = ChordWorker()
+            self.chord_worker.identified.connect(self.showChord)
+            self.chord_worker.unidentified.connect(lambda error: self.statusbar.showMessage(f'Chord identification failed: {error}'))
+        ## Pending UI updates of the action now handling, applied once by flushUpdate()
+        self.update_depth = 0
+        self.action_start = None
+        self.chord_evaluations = 0
 
         # Mode
         self.mode = Mode.CHORD
@@ -31,9 +70,28 @@ class ThreeNotes(Fretboard_ui.Fretboard_ui): # Inherit from Fretboard_ui.py
         ## reset button / mode button event
         self.resetButton.clicked.connect(self.resetEvent)
         self.modeButton.clicked.connect(self.modeChangeEvent)
+        ## session recording, set by --record
+        self.recorder = None
+        self.resetButton.clicked.connect(lambda: self.recordEvent(RESET))
         ## mute check box event
         for i in range(STRING_NUM):
             self.checkBoxs[i].stateChanged.connect(self.selectCheckBoxEvent(stringNum = i + 1))
+        ## undo / redo
+        QtWidgets.QShortcut(QtGui.QKeySequence.Undo, MainWindow, self.undoEvent)
+        QtWidgets.QShortcut(QtGui.QKeySequence.Redo, MainWindow, self.redoEvent)
+        ## change the key / scale of Scale Mode
+        for key, root_step, scale_step in ((QtCore.Qt.Key_Right, 1, 0), (QtCore.Qt.Key_Left, -1, 0),
+                                           (QtCore.Qt.Key_Down, 0, 1), (QtCore.Qt.Key_Up, 0, -1)):
+            QtWidgets.QShortcut(QtGui.QKeySequence(key), MainWindow,
+                                lambda root_step=root_step, scale_step=scale_step: self.scaleStepEvent(root_step, scale_step))
+        ## step through a progression
+        self.progression = []
+        self.progression_step = 0
+        QtWidgets.QShortcut(QtGui.QKeySequence.MoveToNextPage, MainWindow, lambda: self.stepProgression(1))
+        QtWidgets.QShortcut(QtGui.QKeySequence.MoveToPreviousPage, MainWindow, lambda: self.stepProgression(-1))
+        ## key and roman numeral timeline of the chords appended, opened by showTimeline()
+        self.timeline_panel = None
+        QtWidgets.QShortcut(QtGui.QKeySequence(QtCore.Qt.CTRL + QtCore.Qt.Key_Return), MainWindow, self.appendChordEvent)
 
     ######################## Init ########################
 
@@ -41,29 +99,27 @@ class ThreeNotes(Fretboard_ui.Fretboard_ui): # Inherit from Fretboard_ui.py
         '''
             Link lines and points, and init the press event.
         '''
+        if self.fretboard:      # One handler by point number instead of one per line and point
+            self.fretboard.pressEvent = self.pointNumberPressEvent
         for line, point in zip(lines, points):
-            point.mousePressEvent = self.pointPressEvent(point)
-            point.press = False
+            if not self.fretboard:
+                point.mousePressEvent = self.pointPressEvent(point)
+                line.mousePressEvent = self.linePressEvent(line)
             point.hide()
-
             line.point = point
-            line.mousePressEvent = self.linePressEvent(line)
 
     def initString(self, lines: list):
         '''
             Pack every twelve continuously adjacent horizon lines into a string.
         '''
-        class String(list):
-            def __init__(self):
-                super().__init__()
-                self.pressedPoint = None
         strings = []
         for string_idx in range(STRING_NUM):
-            strings.append(String())
+            strings.append(list())
             for note_idx in range(NOTE_PER_STRING):
                 idx = string_idx * NOTE_PER_STRING + note_idx
                 line = lines[idx]
                 line.point.stringNum = string_idx + 1
+                line.point.fret = note_idx + 1
                 strings[-1].append(line)
         return strings
 
@@ -71,123 +127,225 @@ class ThreeNotes(Fretboard_ui.Fretboard_ui): # Inherit from Fretboard_ui.py
         '''
             Init note Mode.
         '''
-        self.notes = {note : list() for note in NOTES}
-        self.noteModePressedPoints = list()
-        for point in self.points:
-            self.notes[point.noteName].append(point)
+        self.note_index = self.model.note_index
+        ## Points now highlighted in Note Mode and Lookup Mode
+        self.note_mode_mask = 0
+        ## Chord formulas of Lookup Mode, built when first entering the mode
+        self.chord_formula_table = None
+        ## Key of Scale Mode as (root pitch class, scale name), and the points of each degree style
+        self.scale = None
+        self.style_masks = dict()
+        self.noteQuery.textChanged.connect(self.noteQueryEvent)
 
     def initAllNoteName(self):
         '''
             Set the initial note name of each string.
         '''
         for string_idx in range(1, STRING_NUM+1):
-            noteName = OPEN_STRING_NOTE[string_idx]['noteName']
-            pitchNum = OPEN_STRING_NOTE[string_idx]['pitchNum']
-            self.setNoteName(string_idx, noteName, pitchNum)
+            self.setNoteName(string_idx, self.model.tuning[string_idx - 1])
 
     ######################## Utility ########################
 
+    @traced('pointPress')
     def pointPress(self, point):
         '''
             The helper function for pressing on fret.
         '''
-        stringNum = point.stringNum
-        string = self.strings[stringNum - 1]
-        if not point.press:
-            if string.pressedPoint and self.mode == Mode.CHORD:
-                string.pressedPoint.hide()
-                string.pressedPoint.press = False
-            string.pressedPoint = point
-            point.show()
-            point.press = True
-            noteName, pitchNum = point.noteName, point.pitchNum
-        else:
-            point.hide()
-            point.press = False
-            string.pressedPoint = None
-            noteName = OPEN_STRING_NOTE[stringNum]['noteName']
-            pitchNum = OPEN_STRING_NOTE[stringNum]['pitchNum']
-        self.component_notes[stringNum] = noteName
-        self.setNoteName(stringNum, noteName, pitchNum)
+        stringNum = point.stringNum       # One pressed fret per string, press again to release
+        self.state.press(stringNum, 0 if self.state.fret(stringNum) == point.fret else point.fret)
+        self.flushUpdate()
+
+    def highlightNotes(self, mask):
+        '''
+            Highlight the points in mask in Note Mode, only showing or hiding the points changed.
+        '''
+        for idx in maskBits(self.note_mode_mask ^ mask):
+            self.points[idx].setVisible(bool(mask >> idx & 1))
+        self.note_mode_mask = mask
+
+    def setPointStyles(self, styles: dict):
+        '''
+            Color the points of each degree in styles (degree number to mask of points), the others plain,
+            only changing the points whose style changed.
+        '''
+        changed = 0
+        for style in set(styles) | set(self.style_masks):
+            changed |= styles.get(style, 0) ^ self.style_masks.get(style, 0)
+        for idx in maskBits(changed):
+            color = next((DEGREE_COLORS[style] for style, mask in styles.items() if mask >> idx & 1), None)
+            self.points[idx].setPixmap(Fretboard_ui.dotPixmap(color))
+        self.style_masks = styles
+
+    def showScale(self, root, scaleName):
+        '''
+            Highlight the notes of a key in Scale Mode, colored by degree, and list the degrees.
+        '''
+        self.scale = (root, scaleName)
+        styles = dict()
+        highlight = 0
+        degrees = []
+        for interval in SCALES[scaleName]:
+            mask = self.note_index.classMask(root + interval)
+            highlight |= mask
+            degree = degreeNumber(interval, scaleName)
+            styles[degree] = styles.get(degree, 0) | mask
+            degrees.append(f'{NOTES[(root + interval) % OCTAVE]}({degreeName(interval, scaleName)})')
+        self.setPointStyles(styles)
+        self.highlightNotes(highlight)
+        self.statusbar.showMessage(f'{NOTES[root]} {scaleName}: ' + ' '.join(degrees))
+
+    def applyVoicing(self, voicing):
+        '''
+            Show a voicing (fret per string from string one, MUTED for muted string) in Chord Mode,
+            without recording an undo step.
+        '''
+        if self.mode != Mode.CHORD:
+            return
+        self.state.setVoicing(voicing)
+        self.flushUpdate()
+
+    def stringPitch(self, stringNum, fret):
+        '''
+            The pitch of string "stringNum" pressed on fret.
+        '''
+        return self.model.tuning[stringNum - 1] + fret
+
+    @contextmanager
+    def batchUpdate(self):
+        '''
+            Collect the UI updates of an action, and apply them once when the outermost batch ends.
+            The state change of the action is one undo step.
+        '''
+        if self.update_depth == 0:
+            self.action_start = self.state.snapshot()
+        self.update_depth += 1
+        try:
+            yield
+        finally:
+            self.update_depth -= 1
+            if self.update_depth == 0 and self.mode == Mode.CHORD:
+                self.state.commit(self.action_start)
+            self.flushUpdate()
+
+    def flushUpdate(self):
+        '''
+            Render the state, unless inside a batch.
+        '''
+        if self.update_depth:
+            return
+        self.render()
+
+    def render(self):
+        '''
+            Update the points, note names, mute check boxes and chord of the strings
+            changed since the last rendered state.
+        '''
+        snapshot = self.state.snapshot()
+        if snapshot == self.rendered:
+            return
+        for idx in range(STRING_NUM):
+            old_fret, fret = self.rendered.frets[idx], snapshot.frets[idx]
+            if old_fret != fret:
+                if old_fret:
+                    self.strings[idx][old_fret - 1].point.hide()
+                if fret:
+                    self.strings[idx][fret - 1].point.show()
+                self.setNoteName(idx + 1, self.stringPitch(idx + 1, fret))
+            muted = bool(snapshot.muted >> idx & 1)
+            if muted != bool(self.rendered.muted >> idx & 1) and self.checkBoxs[idx].isChecked() != muted:
+                self.checkBoxs[idx].blockSignals(True)
+                self.checkBoxs[idx].setChecked(muted)
+                self.checkBoxs[idx].blockSignals(False)
+        self.rendered = snapshot
         self.checkChord()
 
+    @traced('checkChord')
     def checkChord(self):
         '''
-            Check the notes now playing from string six to string one, 
-            sort by the distance to root note, and identify the chord by pychord.
+            Check the pitches now playing, and identify the chord with the lowest pitch as bass
+            by the precomputed chord table, on the chord worker if there is one.
         '''
-        if self.mode == Mode.NOTE:    # Note Mode don't need to show chord
+        if self.mode != Mode.CHORD:    # Note Mode and Lookup Mode don't need to show chord
             return
-        def getNotesPosition(component_notes: list, root_note):
-            notes_position = notes_to_positions(component_notes, root_note)
-            for idx in range(len(notes_position)):
-                notes_position[idx] %= len(NOTES)       # 12 half steps a cycle
-            return notes_position
-
-        root_note = None
-        component_notes = set()          # pychord cannot accept duplicate notes
-        for idx in range(STRING_NUM, 0, -1):      # Order from string six to one to find root note
-            if self.string_muted[idx]:
-                continue
-            if root_note == None:
-                root_note = self.component_notes[idx]
-            component_notes.add(self.component_notes[idx])
-        component_notes = list(component_notes)
-        notes_position = getNotesPosition(component_notes, root_note)
-
-        _, component_notes = zip(*sorted(zip(notes_position, component_notes)))
-        chord = find_chords_from_notes(component_notes)
-        chordName = chord[0].chord if chord else ''
+        self.chord_evaluations += 1
+        pitches = voicingPitches(self.state.voicing(), self.model.tuning)
+        if self.chord_worker is not None:       # Shown by showChord() when answered
+            self.chord_worker.submit(pitches)
+            return
+        if not pitches:        # All strings muted
+            chordName = ''
+            interpretations = []
+        else:
+            if self.chord_table is None:
+                with tracer.span('chord_table.build'):     # pychord's qualities
+                    self.chord_table = getChordTable()
+            with tracer.span('chord_table.lookup'):
+                chordName = self.chord_table.lookupPitches(pitches)
+            with tracer.span('chord_ranking'):
+                interpretations = rankPitches(pitches)
+        self.showChord(chordName, interpretations)
+
+    def showChord(self, chordName, interpretations):
+        '''
+            Show the chord name, or the best interpretation in ranked identification,
+            and list the voicing spread and every interpretation in the tooltip of the chord.
+        '''
+        if self.ranked and interpretations:
+            chordName = interpretations[0].name
+        tracer.count('chord named' if chordName else 'chord unnamed')
+        self.chord_name = chordName
         self.setChordText(chordName)
-        print(component_notes)
-        print(chordName)
+        toolTip = '\n'.join(f'{interpretation.name} ({interpretation.kind})' for interpretation in interpretations)
+        pitches = voicingPitches(self.state.voicing(), self.model.tuning)
+        if len(pitches) > 1:
+            spread = max(pitches) - min(pitches)
+            toolTip = f'{"Close" if spread < OCTAVE else "Open"} voicing, {spread} semitones\n' + toolTip
+        if toolTip != self.textBrowser_chord_identifier.toolTip():
+            self.textBrowser_chord_identifier.setToolTip(toolTip)
     
     def setChordText(self, chordName):
         '''
             Set the text in text browser by chord name.
         '''
-        self.textBrowser_chord_identifier.setHtml("<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
-            "<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
-            "p, li { white-space: pre-wrap; }\n"
-            "</style></head><body style=\" font-family:\'PMingLiU\'; font-size:13pt; font-weight:400; font-style:normal;\">\n"
-            "<p align=\"center\" style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\">"
-            f"<span style=\" font-weight:600;\">{chordName}</span></p></body></html>")
+        self.chord_text_cache.show(chordName, lambda: richText(chordName))
 
-    def setNoteName(self, stringNum, noteName, pitchNum):
+    def setNoteName(self, stringNum, pitch):
         '''
-            Set the note of string "stringNum" by noteName and pitchNum.
+            Set the note of string "stringNum" spelled from pitch.
         '''
-        if self.mode == Mode.NOTE:      # Note Mode don't need to show pressed note name of the string
+        if self.mode != Mode.CHORD:      # Note Mode and Lookup Mode don't need to show pressed note name of the string
             return
-        assert(0 < len(noteName) and len(noteName) < 3)
-        s = f'{noteName[0]}'
-        if len(noteName) == 2:
-            s += f'<sup>{noteName[1]}</sup>'
-        s += f'<sub>{pitchNum}</sub>'
-        self.textBrowsers[stringNum-1].setHtml("<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
-            "<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
-            "p, li { white-space: pre-wrap; }\n"
-            "</style></head><body style=\" font-family:\'PMingLiU\'; font-size:13pt; font-weight:400; font-style:normal;\">\n"
-            "<p align=\"center\" style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\">"
-            f"<span style=\" font-weight:600;\">{s}</span></p></body></html>")
+        def html():
+            noteName, octave = spellPitch(pitch)
+            s = f'{noteName[0]}'
+            if len(noteName) == 2:
+                s += f'<sup>{noteName[1]}</sup>'
+            s += f'<sub>{octave}</sub>'
+            return richText(s)
+        self.note_name_caches[stringNum-1].show(pitch, html)
 
     ######################## Event Handler ########################
 
+    @traced('pointPressEventHelper')
     def pointPressEventHelper(self, point):
         '''
             Press the different points by mode.
 
             Chord mode: Press the single point.
             Note mode: Press all the same notes, even in different pitch.
+            Scale mode: Show the scale on the pressed note.
         '''
-        if self.mode == Mode.CHORD:
-            self.pointPress(point)
-        elif self.mode == Mode.NOTE:
-            self.resetEvent()
-            same_note_points = self.notes[point.noteName]
-            self.noteModePressedPoints = same_note_points
-            for same_note_point in same_note_points:
-                self.pointPress(same_note_point)
+        with self.batchUpdate():
+            if self.mode == Mode.CHORD:
+                self.pointPress(point)
+            elif self.mode == Mode.NOTE:
+                self.state.reset()
+                self.setNoteQueryText(NOTES[point.pitch % OCTAVE])
+                self.highlightNotes(self.note_index.classMask(point.pitch))
+            elif self.mode == Mode.SCALE:       # The clicked note becomes the root
+                scaleName = self.scale[1] if self.scale else SCALE_NAMES[0]
+                self.setNoteQueryText(f'{NOTES[point.pitch % OCTAVE]} {scaleName}')
+                self.showScale(point.pitch % OCTAVE, scaleName)
 
     def linePressEvent(self, line):
         '''
@@ -196,6 +354,7 @@ class ThreeNotes(Fretboard_ui.Fretboard_ui): # Inherit from Fretboard_ui.py
         def linePressEventWrapper(e):
             point = line.point
             self.pointPressEventHelper(point)
+            self.recordEvent(POINT, self.point_numbers[point])
         return linePressEventWrapper
 
     def pointPressEvent(self, point):
@@ -204,51 +363,282 @@ class ThreeNotes(Fretboard_ui.Fretboard_ui): # Inherit from Fretboard_ui.py
         '''
         def pointPressEventWrapper(e):
             self.pointPressEventHelper(point)
+            self.recordEvent(POINT, self.point_numbers[point])
         return pointPressEventWrapper
 
+    def pointNumberPressEvent(self, idx):
+        '''
+            Press on the point or the line of point number idx, on the painted fretboard.
+        '''
+        self.pointPressEventHelper(self.points[idx])
+        self.recordEvent(POINT, idx)
+
     def resetEvent(self):
         '''
             Reset to original state.
         '''
-        self.component_notes = {stringNum: val['noteName'] for stringNum, val in OPEN_STRING_NOTE.items()}
-        if self.mode == Mode.CHORD:
-            for string in self.strings:
-                if string.pressedPoint != None:
-                    point = string.pressedPoint
-                    self.pointPress(point)
-        elif self.mode == Mode.NOTE:
-            for point in self.noteModePressedPoints:
-                self.pointPress(point)
-            self.noteModePressedPoints = list()
-        for idx in range(STRING_NUM):
-            if self.string_muted[idx + 1]:
-                self.checkBoxs[idx].click()
-        self.checkChord()
+        with self.batchUpdate():
+            if self.mode != Mode.CHORD:
+                self.setNoteQueryText('')
+                self.highlightNotes(0)
+                self.setPointStyles(dict())
+                self.scale = None
+                self.statusbar.clearMessage()
+            self.state.reset()
 
     def modeChangeEvent(self):
         '''
-            Change between Chord Mode and Note Mode.
+            Change from Chord Mode to Note Mode to Lookup Mode to Scale Mode, and back to Chord Mode.
+        '''
+        modes = list(Mode)
+        self.setMode(modes[(modes.index(self.mode) + 1) % len(modes)])
+
+    def setMode(self, mode):
+        '''
+            Change to a mode, with the query placeholder and completer of that mode.
         '''
-        self.resetEvent()
-        if self.mode == Mode.CHORD:
-            self.mode = Mode.NOTE
-        elif self.mode == Mode.NOTE:
-            self.mode = Mode.CHORD
+        self.resetEvent()       # Applied before leaving the mode
+        self.mode = mode
         self.modeButton.setText(self.mode.value)
+        self.noteQuery.setVisible(self.mode != Mode.CHORD)
+        if self.mode == Mode.NOTE:
+            self.noteQuery.setPlaceholderText("C E G / C#4 / A+7")
+            self.noteQuery.setCompleter(None)
+        elif self.mode == Mode.LOOKUP:
+            self.noteQuery.setPlaceholderText("Chord name")
+            self.noteQuery.setCompleter(self.chordCompleter())
+        elif self.mode == Mode.SCALE:
+            self.noteQuery.setPlaceholderText("A minor pentatonic")
+            self.noteQuery.setCompleter(None)
+        self.recordEvent(MODE, list(Mode).index(self.mode))
+
+    def chordCompleter(self):
+        '''
+            Completer of every chord name in the chord formula table, filtered as typed.
+        '''
+        if self.chord_formula_table is None:
+            self.chord_formula_table = getChordFormulaTable()
+            ## Not owned by the line edit, which deletes its own completer when it is removed
+            self.chord_completer = QtWidgets.QCompleter(self.chord_formula_table.names, self.centralwidget)
+            self.chord_completer.setModelSorting(QtWidgets.QCompleter.CaseSensitivelySortedModel)
+            self.chord_completer.setCaseSensitivity(QtCore.Qt.CaseSensitive)
+        return self.chord_completer
+
+    def noteQueryEvent(self, text):
+        '''
+            Highlight the notes typed in Note Mode, e.g. "C E G", "C#4" or "A+7",
+            the component notes of the chord typed in Lookup Mode, or the key typed in Scale Mode.
+        '''
+        if self.mode == Mode.LOOKUP:
+            self.chordLookup(text)
+            return
+        if self.mode == Mode.SCALE:
+            try:
+                self.showScale(*parseScale(text))
+            except ValueError:      # Keep the last key while typing
+                pass
+            return
+        try:
+            mask = self.note_index.query(text)
+        except ValueError:      # Keep the last highlight while typing
+            return
+        self.highlightNotes(mask)
+
+    def chordLookup(self, chordName):
+        '''
+            Show the component notes of chord "chordName" and highlight all of their points.
+        '''
+        formula = self.chord_formula_table.lookup(chordName)
+        if formula is None:
+            candidates = self.chord_formula_table.complete(chordName.strip())
+            self.statusbar.showMessage(f'{len(candidates)} chords: ' + ' '.join(candidates[:CHORD_CANDIDATE_NUM]) if chordName.strip() else '')
+            self.highlightNotes(0)
+            return
+        notes, mask = formula
+        self.statusbar.showMessage(f'{chordName.strip()}: ' + ' '.join(notes))
+        highlight = 0
+        for note in maskBits(mask):
+            highlight |= self.note_index.classMask(note)
+        self.highlightNotes(highlight)
+
+    def scaleStepEvent(self, root_step, scale_step):
+        '''
+            Move the key of Scale Mode by semitones, or to another scale on the same root.
+        '''
+        if self.mode != Mode.SCALE:
+            return
+        root, scaleName = self.scale or (0, SCALE_NAMES[0])
+        root = (root + root_step) % OCTAVE
+        scaleName = SCALE_NAMES[(SCALE_NAMES.index(scaleName) + scale_step) % len(SCALE_NAMES)]
+        self.setNoteQueryText(f'{NOTES[root]} {scaleName}')
+        self.showScale(root, scaleName)
+
+    def setNoteQueryText(self, text):
+        self.noteQuery.blockSignals(True)
+        self.noteQuery.setText(text)
+        self.noteQuery.blockSignals(False)
 
     def selectCheckBoxEvent(self, stringNum):
         '''
             Mute specific string.
         '''
         def selectCheckBoxEventWrapper():
-            self.string_muted[stringNum] = not self.string_muted[stringNum]
-            self.checkChord()
+            with self.batchUpdate():
+                self.state.toggleMute(stringNum)
+            self.recordEvent(MUTE, stringNum)
         return selectCheckBoxEventWrapper
 
+    def undoEvent(self):
+        '''
+            Undo the last action of Chord Mode.
+        '''
+        if self.mode == Mode.CHORD and self.state.undo():
+            self.flushUpdate()
+        self.recordEvent(UNDO)
+
+    def redoEvent(self):
+        '''
+            Redo the last undone action of Chord Mode.
+        '''
+        if self.mode == Mode.CHORD and self.state.redo():
+            self.flushUpdate()
+        self.recordEvent(REDO)
+
+    def recordEvent(self, kind, argument = 0):
+        '''
+            Log a user event and what it shows, when recording a session.
+        '''
+        if self.recorder is not None:
+            self.recorder.record(self, kind, argument)
+
+    def setProgression(self, chordNames):
+        '''
+            Voice-lead a progression of chord names, list it in the timeline, and show its first chord.
+        '''
+        from voice_leading import voiceLead
+        voicings, _ = voiceLead(chordNames, tuning = self.model.tuning)
+        self.progression = list(zip(chordNames, voicings))
+        self.showTimeline().extend(chordNames)
+        self.progression_step = 0
+        self.stepProgression(0)
+
+    def stepProgression(self, delta):
+        '''
+            Show the chord "delta" steps away in the progression, in Chord Mode.
+        '''
+        if not self.progression or self.mode != Mode.CHORD:
+            return
+        from voicing_enumerator import formatVoicing
+        self.progression_step = (self.progression_step + delta) % len(self.progression)
+        chordName, voicing = self.progression[self.progression_step]
+        self.applyVoicing(voicing)
+        self.statusbar.showMessage(f'{self.progression_step + 1}/{len(self.progression)} {chordName}: {formatVoicing(voicing)}')
+
+    def showTimeline(self):
+        '''
+            Open the timeline panel beside the fretboard, and return it.
+        '''
+        if self.timeline_panel is None:
+            from timeline_panel import TimelinePanel
+            window = self.centralwidget.window()
+            self.timeline_panel = TimelinePanel(window)
+            self.timeline_panel.keySelected.connect(self.timelineKeyEvent)
+            window.addDockWidget(QtCore.Qt.RightDockWidgetArea, self.timeline_panel)
+        self.timeline_panel.show()
+        return self.timeline_panel
+
+    def appendChordEvent(self):
+        '''
+            Append the chord now shown to the timeline, in Chord Mode.
+        '''
+        if self.mode == Mode.CHORD and self.chord_name:
+            self.showTimeline().extend([self.chord_name])
+
+    def timelineKeyEvent(self, root, scaleName):
+        '''
+            Show the key of the chord clicked in the timeline on the fretboard, changing to Scale Mode.
+        '''
+        if self.mode != Mode.SCALE:
+            self.setMode(Mode.SCALE)
+        self.setNoteQueryText(f'{NOTES[root]} {scaleName}')
+        self.showScale(root, scaleName)
+
+class StartupProfiler(QtCore.QObject):
+    '''
+        Report the time spent in imports, widget construction and the first paint, then quit.
+    '''
+    def __init__(self, MainWindow, times: dict):
+        super().__init__()
+        self.times = times
+        MainWindow.installEventFilter(self)
+
+    def eventFilter(self, obj, e):
+        if e.type() == QtCore.QEvent.Paint and 'first paint' not in self.times:
+            self.times['first paint'] = time.perf_counter()
+            QtCore.QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        previous = _import_start
+        for step, moment in self.times.items():
+            print(f'{step:<20}{(moment - previous) * 1e3:8.1f} ms')
+            previous = moment
+        print(f'{"total":<20}{(previous - _import_start) * 1e3:8.1f} ms')
+        QtWidgets.QApplication.quit()
+
 if __name__ == "__main__":
     import sys
+    from board_model import parseTuning
+    times = {'imports': _import_end}
     app = QtWidgets.QApplication(sys.argv)
-    MainWindow = QtWidgets.QMainWindow()
-    ui = ThreeNotes(MainWindow)
-    MainWindow.show()
+    times['QApplication'] = time.perf_counter()
+    ## A board per --tuning (standard tuning without one), --boards of each, sharing one model per tuning
+    tunings = [sys.argv[idx + 1] for idx, arg in enumerate(sys.argv) if arg == '--tuning'] or [None]
+    board_num = int(sys.argv[sys.argv.index('--boards') + 1]) if '--boards' in sys.argv else 1
+    boards = []
+    for tuning in tunings:
+        for _ in range(board_num):
+            MainWindow = QtWidgets.QMainWindow()
+            boards.append((MainWindow, ThreeNotes(MainWindow, painted = '--painted' in sys.argv, background = not {'--sync', '--record'} & set(sys.argv),
+                                                  ranked = '--ranked' in sys.argv, tuning = tuning and parseTuning(tuning))))
+            if tuning:
+                MainWindow.setWindowTitle(f'ThreeNotes ({tuning})')
+    MainWindow, ui = boards[0]
+    times['widget construction'] = time.perf_counter()
+    if '--profile-startup' in sys.argv:
+        profiler = StartupProfiler(MainWindow, times)
+    if '--midi' in sys.argv:
+        from midi_input import MidiFollower, portMessages, fileMessages
+        source = sys.argv[sys.argv.index('--midi') + 1]
+        messages = fileMessages(source) if source.lower().endswith(('.mid', '.midi')) else portMessages(source)
+        follower = MidiFollower(ui, messages)
+        follower.finished.connect(follower.report)
+        follower.start()
+    if '--trace' in sys.argv:
+        tracer.enabled = True
+        trace_path = sys.argv[sys.argv.index('--trace') + 1]
+        app.aboutToQuit.connect(lambda: tracer.export(trace_path))
+    if '--stats' in sys.argv:
+        from stats_panel import StatsPanel
+        tracer.enabled = True
+        stats_panel = StatsPanel()
+        stats_panel.show()
+    if '--record' in sys.argv:        # Chords identified on the GUI thread, so each event is recorded with its chord
+        ui.recorder = SessionRecorder(sys.argv[sys.argv.index('--record') + 1], ui.ranked, ui.model.tuning)
+        app.aboutToQuit.connect(ui.recorder.close)
+    if '--timeline' in sys.argv:
+        ui.showTimeline()
+    if '--analyze' in sys.argv:
+        from key_analysis import readChordNames
+        with open(sys.argv[sys.argv.index('--analyze') + 1], 'r', encoding='utf-8') as f:
+            ui.showTimeline().extend(readChordNames(f))
+    if '--progression' in sys.argv:
+        ui.setProgression(sys.argv[sys.argv.index('--progression') + 1].split())
+    if '--audio' in sys.argv:
+        from audio_chords import analyzeFile, animateChordTrack
+        track = analyzeFile(sys.argv[sys.argv.index('--audio') + 1])
+        ui.showTimeline().extend(segment.name for segment in track if segment.name)
+        animateChordTrack(ui, track)
+    for window, _ in boards:
+        window.show()
     sys.exit(app.exec_())
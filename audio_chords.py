@@ -0,0 +1,202 @@
+'''
+    Chord recognition of WAV audio by chromagram, without Qt.
+
+    The audio is read in fixed-size blocks of frames, so memory does not grow with the file length.
+    Each frame is folded into a 12-bin chroma vector, and its strongest pitch classes are named
+    by the chord table of checkChord().
+
+    Usage: python audio_chords.py song.wav ...
+           python audio_chords.py - < song.wav
+'''
+import sys
+import wave
+from collections import namedtuple
+from multiprocessing import Pool
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from chord_table import getChordTable, PITCH_CLASS_NUM
+from fretboard_state import OPEN_STRING_PITCH, MUTED
+from const import *
+
+FRAME_SIZE = 8192       # Samples per FFT frame
+HOP_SIZE = 4096         # Samples between frame starts
+BLOCK_HOPS = 64         # Frames transformed by one FFT call
+MIN_FREQ, MAX_FREQ = 60.0, 2000.0       # Range of the chroma
+BASS_MAX_FREQ = 260.0       # Range of the bass note
+BASS_THRESHOLD = 0.3        # Weaker peaks than this ratio of the strongest in the bass range are not the bass
+NOTE_THRESHOLD = 0.4        # Pitch classes weaker than this ratio of the strongest are not chord notes
+MAX_NOTES = 4
+SILENCE_LEVEL = 1e-3        # RMS of a silent frame, full scale is 1
+
+## A chord of the track, lasting from start to end seconds
+ChordSegment = namedtuple('ChordSegment', ['start', 'end', 'name', 'mask', 'bass'])
+
+def pitchClass(freqs):
+    '''
+        Pitch class of the nearest note of each frequency, 0 is C like NOTES.
+    '''
+    return np.rint(69 + 12 * np.log2(freqs / 440.0)).astype(int) % PITCH_CLASS_NUM
+
+def chromaMatrix(rate: int, frame_size: int = FRAME_SIZE):
+    '''
+        The (FFT bins, 12) matrix folding the magnitude spectrum of a frame into pitch classes.
+    '''
+    freqs = np.fft.rfftfreq(frame_size, 1.0 / rate)
+    matrix = np.zeros((len(freqs), PITCH_CLASS_NUM))
+    valid = (freqs >= MIN_FREQ) & (freqs <= MAX_FREQ)
+    matrix[np.flatnonzero(valid), pitchClass(freqs[valid])] = 1.0
+    return matrix
+
+def bassPitchClass(magnitude, rate: int, frame_size: int = FRAME_SIZE):
+    '''
+        Pitch class of the lowest strong spectral peak of each frame in the bass range.
+    '''
+    low, high = int(MIN_FREQ * frame_size / rate), int(BASS_MAX_FREQ * frame_size / rate) + 1
+    left, bins, right = magnitude[:, low - 1:high - 1], magnitude[:, low:high], magnitude[:, low + 1:high + 1]
+    peaks = (bins >= left) & (bins > right) & (bins >= BASS_THRESHOLD * bins.max(axis=1, keepdims=True))
+    idx = np.argmax(peaks, axis=1)      # First peak of each frame
+    rows = np.arange(len(bins))
+    ## Parabolic interpolation of the peak between bins, the bins are too wide for low notes
+    a, b, c = left[rows, idx], bins[rows, idx], right[rows, idx]
+    curve = a - 2 * b + c
+    offset = np.where(curve < 0, 0.5 * (a - c) / np.where(curve < 0, curve, -1.0), 0.0)
+    return pitchClass(np.maximum(low + idx + offset, 1) * rate / frame_size)
+
+def readSamples(wav: wave.Wave_read, hops: int = BLOCK_HOPS, hop_size: int = HOP_SIZE):
+    '''
+        Mono samples in [-1, 1), "hops" hops at a time.
+    '''
+    width = wav.getsampwidth()
+    channels = wav.getnchannels()
+    if width not in (1, 2, 4):
+        raise ValueError(f'{width * 8}-bit WAV is not supported')
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    while True:
+        data = wav.readframes(hops * hop_size)
+        if not data:
+            return
+        samples = np.frombuffer(data, dtype=dtype).reshape(-1, channels).mean(axis=1)
+        if width == 1:      # 8-bit WAV is unsigned
+            samples -= 128
+        yield samples / float(1 << (width * 8 - 1))
+
+def chromaFrames(wav: wave.Wave_read, frame_size: int = FRAME_SIZE, hop_size: int = HOP_SIZE):
+    '''
+        The (chroma, bass pitch class, rms) of every frame, one block of frames at a time.
+    '''
+    rate = wav.getframerate()
+    window = np.hanning(frame_size)
+    chroma_matrix = chromaMatrix(rate, frame_size)
+    def analyze(frames):
+        magnitude = np.abs(np.fft.rfft(frames * window, axis=1))
+        rms = np.sqrt((frames ** 2).mean(axis=1))
+        return magnitude @ chroma_matrix, bassPitchClass(magnitude, rate, frame_size), rms
+
+    carry = np.zeros(frame_size - hop_size)     # Overlap with the next block
+    for samples in readSamples(wav, hop_size=hop_size):
+        buffer = np.concatenate((carry, samples))
+        if len(buffer) < frame_size:        # Pad the last frame
+            buffer = np.concatenate((buffer, np.zeros(frame_size - len(buffer))))
+        frames = sliding_window_view(buffer, frame_size)[::hop_size]
+        carry = buffer[len(frames) * hop_size:]
+        yield analyze(frames)
+    ## Samples after the start of the next frame are in no frame yet, end them with a zero-padded frame
+    if len(carry) > frame_size - hop_size:
+        yield analyze(np.concatenate((carry, np.zeros(frame_size - len(carry))))[None, :])
+
+def chordOfChroma(chroma, bass: int, rms, table = None):
+    '''
+        The (chord name, pitch-class mask, bass) of one frame, ('', 0, None) if silent or unnamed.
+    '''
+    table = table or getChordTable()
+    if rms < SILENCE_LEVEL or chroma.max() <= 0:
+        return '', 0, None
+    order = np.argsort(chroma)[::-1]
+    notes = [int(pc) for pc in order[:MAX_NOTES] if chroma[pc] >= NOTE_THRESHOLD * chroma[order[0]]]
+    ## Drop the weakest note until the set has a name
+    while notes:
+        mask = 0
+        for pc in notes:
+            mask |= 1 << pc
+        ## The lowest note if it is a chord note, else the strongest
+        root = bass if bass in notes else notes[0]
+        name = table.lookup(mask, root)
+        if name:
+            return name, mask, root
+        notes.pop()
+    return '', 0, None
+
+def chordTrack(wav: wave.Wave_read, frame_size: int = FRAME_SIZE, hop_size: int = HOP_SIZE):
+    '''
+        Yield a ChordSegment whenever the chord changes, without keeping the frames.
+    '''
+    table = getChordTable()
+    seconds_per_hop = hop_size / wav.getframerate()
+    current, start, frame_num = None, 0.0, 0
+    for chroma, bass, rms in chromaFrames(wav, frame_size, hop_size):
+        for idx in range(len(rms)):
+            chord = chordOfChroma(chroma[idx], int(bass[idx]), rms[idx], table)
+            if chord != current:
+                if current is not None:
+                    yield ChordSegment(start, frame_num * seconds_per_hop, *current)
+                current, start = chord, frame_num * seconds_per_hop
+            frame_num += 1
+    if current is not None:
+        yield ChordSegment(start, wav.getnframes() / wav.getframerate(), *current)
+
+def analyzeFile(path: str):
+    '''
+        The chord track of a WAV file, "-" for stdin.
+    '''
+    with wave.open(sys.stdin.buffer if path == '-' else path, 'rb') as wav:
+        return list(chordTrack(wav))
+
+def analyzeFiles(paths: list, workers: int = None):
+    '''
+        Yield (path, chord track) of WAV files in order, analyzed by a process pool.
+    '''
+    if len(paths) == 1:
+        yield paths[0], analyzeFile(paths[0])
+        return
+    with Pool(workers) as pool:
+        yield from zip(paths, pool.imap(analyzeFile, paths))
+
+def segmentVoicing(segment: ChordSegment, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        A voicing of the segment's pitch classes on tuning (open string pitch from string one),
+        a note per string upward from the bass on string six.
+    '''
+    voicing = [MUTED] * STRING_NUM
+    if segment.bass is None:
+        return voicing
+    notes = sorted((pc for pc in range(PITCH_CLASS_NUM) if segment.mask >> pc & 1),
+                   key=lambda pc: (pc - segment.bass) % PITCH_CLASS_NUM)
+    pitch = 0
+    for stringIdx, pc in zip(range(STRING_NUM - 1, -1, -1), notes):
+        fret = (pc - tuning[stringIdx]) % PITCH_CLASS_NUM
+        while tuning[stringIdx] + fret <= pitch:
+            fret += PITCH_CLASS_NUM
+        if fret > NOTE_PER_STRING:
+            break
+        voicing[stringIdx] = fret
+        pitch = tuning[stringIdx] + fret
+    return voicing
+
+def animateChordTrack(ui, track: list, speed: float = 1.0):
+    '''
+        Show each segment of a chord track on a ThreeNotes window at its time.
+    '''
+    from PyQt5 import QtCore
+    for segment in track:
+        voicing = segmentVoicing(segment, ui.model.tuning)
+        QtCore.QTimer.singleShot(int(segment.start * 1000 / speed), lambda voicing=voicing: ui.applyVoicing(voicing))
+
+def formatTime(seconds: float):
+    return f'{int(seconds // 60)}:{seconds % 60:06.3f}'
+
+if __name__ == '__main__':
+    for path, track in analyzeFiles(sys.argv[1:] or ['-']):
+        if len(sys.argv) > 2:
+            print(f'# {path}')
+        for segment in track:
+            print(f'{formatTime(segment.start)} {formatTime(segment.end)} {segment.name or "N"}')
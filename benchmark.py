@@ -0,0 +1,716 @@
+'''
+    Micro-benchmarks of ThreeNotes.
+
+    Usage: python benchmark.py [name ...] [--output results.json] [--baseline baseline.json] [--tolerance 0.5]
+'''
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from const import *
+
+## Seconds per call of the recorded measurements, written by --output and compared by --baseline
+RESULTS = dict()
+
+def record(name, seconds):
+    '''
+        Record a measurement for the machine-readable results and print it.
+    '''
+    RESULTS[name] = seconds
+    print(f'{name:<24}{seconds * 1e6:10.2f} us')
+
+_qt_application = None
+
+def qtApplication():
+    '''
+        The QApplication for benchmarks, offscreen unless a platform is given, kept alive for every benchmark.
+    '''
+    global _qt_application
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5 import QtWidgets
+    if _qt_application is None:
+        _qt_application = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    return _qt_application
+
+def timeit(func, number):
+    '''
+        Return the mean seconds per call of func over "number" calls.
+    '''
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+def bestOf(func, number, repeat = 5):
+    '''
+        Return the fastest mean seconds per call of "repeat" rounds, less noisy for comparing runs.
+    '''
+    return min(timeit(func, number) for _ in range(repeat))
+
+def randomVoicings(number, seed = 0):
+    '''
+        Random pitches of the unmuted strings, ordered from string one to six.
+    '''
+    from pitch import voicingPitches
+    rng = random.Random(seed)
+    return [voicingPitches([rng.randint(-1, NOTE_PER_STRING) for _ in range(STRING_NUM)])       # -1 for muted
+            for _ in range(number)]
+
+def pychordChordName(pitches):
+    '''
+        Chord identification of checkChord() before the chord table, by the note names from the lowest pitch.
+    '''
+    from pychord import find_chords_from_notes
+    from pychord.analyzer import notes_to_positions
+    if not pitches:
+        return ''
+    notes = [NOTES[pitch % len(NOTES)] for pitch in sorted(pitches)]
+    root_note = notes[0]
+    component_notes = list(set(notes))
+    notes_position = [position % len(NOTES) for position in notes_to_positions(component_notes, root_note)]
+    _, component_notes = zip(*sorted(zip(notes_position, component_notes)))
+    chord = find_chords_from_notes(component_notes)
+    return chord[0].chord if chord else ''
+
+def verifyChordTable():
+    '''
+        Check the chord table agrees with the pychord path on every key (takes minutes).
+    '''
+    from chord_table import ChordTable, MASK_NUM, PITCH_CLASS_NUM
+    table = ChordTable()
+    mismatch = 0
+    for mask in range(1, MASK_NUM):
+        for bass in range(PITCH_CLASS_NUM):
+            if not mask >> bass & 1:
+                continue
+            pitches = [bass] + [PITCH_CLASS_NUM + i for i in range(PITCH_CLASS_NUM) if mask >> i & 1 and i != bass]
+            if table.lookup(mask, bass) != pychordChordName(pitches):
+                mismatch += 1
+    print(f'chord table mismatches against pychord: {mismatch}')
+
+def benchChordTable():
+    '''
+        Chord table lookup against the pychord path.
+    '''
+    from chord_table import ChordTable
+
+    start = time.perf_counter()
+    table = ChordTable()
+    print(f'chord table build: {(time.perf_counter() - start) * 1e3:.1f} ms')
+
+    voicings = randomVoicings(1000)
+    number = 5
+    pychord_time = timeit(lambda: [pychordChordName(pitches) for pitches in voicings], number) / len(voicings)
+    table_time = timeit(lambda: [table.lookupPitches(pitches) for pitches in voicings], number) / len(voicings)
+    print(f'pychord:     {pychord_time * 1e6:8.2f} us/voicing')
+    print(f'chord table: {table_time * 1e6:8.2f} us/voicing ({pychord_time / table_time:.0f}x)')
+
+def benchRanking():
+    '''
+        Ranked interpretations over every root against the single pychord call.
+    '''
+    from chord_ranking import rankPitches, qualityTable, tensionBits
+
+    qualityTable()
+    tensionBits()
+    voicings = [pitches for pitches in randomVoicings(1000) if pitches]
+    pychord_time = timeit(lambda: [pychordChordName(pitches) for pitches in voicings], 3) / len(voicings)
+    ranking_time = timeit(lambda: [rankPitches(pitches) for pitches in voicings], 3) / len(voicings)
+    found = sum(1 for pitches in voicings if rankPitches(pitches))
+    print(f'pychord:     {pychord_time * 1e6:8.2f} us/voicing')
+    print(f'rankChord:   {ranking_time * 1e6:8.2f} us/voicing ({pychord_time / ranking_time:.1f}x), '
+          f'{found} of {len(voicings)} voicings interpreted')
+
+def benchBatch():
+    '''
+        Batched identification of voicings against one call per voicing.
+    '''
+    import numpy as np
+    from chord_analyzer import identify, identifyBatch, MUTED
+
+    rng = np.random.default_rng(0)
+    voicings = rng.integers(MUTED, NOTE_PER_STRING + 1, size=(100000, STRING_NUM))
+    identifyBatch(voicings[:1])     # Build the chord table
+
+    start = time.perf_counter()
+    single = [identify(voicing) for voicing in voicings.tolist()]
+    single_time = (time.perf_counter() - start) / len(voicings)
+    start = time.perf_counter()
+    batch = identifyBatch(voicings)
+    batch_time = (time.perf_counter() - start) / len(voicings)
+    assert(list(batch) == single)
+    print(f'identify:      {single_time * 1e6:8.3f} us/voicing')
+    print(f'identifyBatch: {batch_time * 1e6:8.3f} us/voicing ({single_time / batch_time:.0f}x)')
+
+def benchEnumerate():
+    '''
+        Voicing enumeration throughput by the number of worker processes.
+    '''
+    import os
+    from voicing_enumerator import enumerateVoicings
+
+    workers = 1
+    base_rate = None
+    while workers <= os.cpu_count():
+        start = time.perf_counter()
+        _, searched = enumerateVoicings(frets=12, workers=workers)
+        rate = searched / (time.perf_counter() - start)
+        base_rate = base_rate or rate
+        print(f'{workers:3d} workers: {rate:14,.0f} voicings/s ({rate / base_rate:.2f}x)')
+        workers *= 2
+
+def benchVoicingIndex():
+    '''
+        Reverse chord lookup and voicing lookup on the memory-mapped voicing index.
+    '''
+    import os
+    import tempfile
+    from voicing_enumerator import enumerateVoicings
+    from voicing_index import writeIndex, VoicingIndex
+
+    index, _ = enumerateVoicings(frets=12)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'index.bin')
+        writeIndex(index, path)
+        start = time.perf_counter()
+        voicing_index = VoicingIndex(path)
+        print(f'open: {(time.perf_counter() - start) * 1e6:.1f} us for {len(voicing_index)} voicings, {os.path.getsize(path)} bytes')
+
+        names = voicing_index.chordNames()
+        voicings = voicing_index.voicings[::max(1, len(voicing_index) // 1000)].copy()
+        chord_time = timeit(lambda: [voicing_index.voicingsOf(name) for name in names], 10) / len(names)
+        voicing_time = timeit(lambda: [voicing_index.chordOf(voicing) for voicing in voicings], 10) / len(voicings)
+        print(f'chord -> voicings: {chord_time * 1e6:8.2f} us')
+        print(f'voicing -> chord:  {voicing_time * 1e6:8.2f} us')
+        voicing_index.close()
+
+def benchFretboard():
+    '''
+        Window construction and memory of the widget fretboard against the painted fretboard.
+    '''
+    import tracemalloc
+    from PyQt5 import QtCore, QtWidgets
+    from ThreeNotes import ThreeNotes
+
+    qtApplication()
+    ThreeNotes(QtWidgets.QMainWindow())     # Warm up the chord table and Qt
+    number = 10
+    for painted in (False, True):
+        windows = []
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(number):
+            MainWindow = QtWidgets.QMainWindow()
+            windows.append((MainWindow, ThreeNotes(MainWindow, painted)))
+        elapsed = (time.perf_counter() - start) / number
+        memory = tracemalloc.get_traced_memory()[0] / number
+        tracemalloc.stop()
+        objects = len(windows[0][0].findChildren(QtCore.QObject))
+        print(f'{"painted" if painted else "widgets"}: {elapsed * 1e3:7.2f} ms/window, '
+              f'{memory / 1024:7.1f} KiB Python memory/window, {objects} QObjects/window')
+
+def benchLabels():
+    '''
+        Per-click cost of a note label update, parsing HTML every time against the document cache.
+    '''
+    from PyQt5 import QtWidgets
+    from text_cache import DocumentCache, richText
+
+    qtApplication()
+    rng = random.Random(0)
+    ## The labels of one string over a session of clicks on its frets
+    labels = [(NOTES[rng.randrange(len(NOTES))], rng.randint(2, 5)) for _ in range(2000)]
+    labels = [(key, richText(f'{key[0]}<sub>{key[1]}</sub>')) for key in set(labels[:NOTE_PER_STRING + 1])] * 100
+    rng.shuffle(labels)
+
+    textBrowser = QtWidgets.QTextBrowser()
+    html_time = timeit(lambda: [textBrowser.setHtml(html) for _, html in labels], 1) / len(labels)
+    cache = DocumentCache(QtWidgets.QTextBrowser(), NOTE_PER_STRING + 1)
+    cache_time = timeit(lambda: [cache.show(key, lambda: html) for key, html in labels], 1) / len(labels)
+    print(f'setHtml:        {html_time * 1e6:8.2f} us/label')
+    print(f'document cache: {cache_time * 1e6:8.2f} us/label ({html_time / cache_time:.1f}x, {cache.hits} hits, {cache.misses} misses)')
+
+## Fast enough for a short run, slow enough that every chord is displayed on its own, not merged with the next one
+MIDI_SPEED = 20
+
+def benchMidi():
+    '''
+        Note-to-display latency of replaying a MIDI file of strummed chords at MIDI_SPEED times the tempo.
+    '''
+    import tempfile
+    import mido
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from midi_input import MidiFollower, fileMessages
+
+    app = qtApplication()
+    MainWindow = QtWidgets.QMainWindow()
+    ui = ThreeNotes(MainWindow)
+    track = mido.MidiTrack()
+    ticks = mido.MidiFile().ticks_per_beat      # 500 ms per beat at the default tempo
+    for _ in range(25):
+        for chord in ([48, 52, 55, 60, 64], [45, 52, 57, 60, 64], [41, 48, 53, 57, 60], [43, 47, 50, 55, 59]):
+            for idx, note in enumerate(chord):      # Strummed, a few ms between strings
+                track.append(mido.Message('note_on', note=note, velocity=90, time=ticks // 100 if idx else 0))
+            for idx, note in enumerate(chord):
+                track.append(mido.Message('note_off', note=note, time=ticks // 5 if idx == 0 else 0))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'chords.mid')
+        midi_file = mido.MidiFile()
+        midi_file.tracks.append(track)
+        midi_file.save(path)
+
+        follower = MidiFollower(ui, fileMessages(path, MIDI_SPEED))
+        follower.finished.connect(app.quit)
+        follower.start()
+        app.exec_()
+    follower.report()
+
+def writeChordWav(path, seconds, rate = 44100):
+    '''
+        A mono WAV of strummed C Am F G chords, two seconds each, written a chord at a time.
+    '''
+    import wave
+    import numpy as np
+    t = np.arange(2 * rate) / rate
+    chords = []
+    for chord in ([48, 52, 55, 60, 64], [45, 52, 57, 60, 64], [41, 48, 53, 57, 60], [43, 47, 50, 55, 59]):
+        samples = 0
+        for note in chord:
+            freq = 440.0 * 2 ** ((note - 69) / 12)
+            samples = samples + sum(np.sin(2 * np.pi * freq * harmonic * t) / harmonic ** 2 for harmonic in (1, 2, 3))
+        samples *= np.exp(-t)
+        chords.append((samples / np.abs(samples).max() * 16000).astype('<i2').tobytes())
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        for idx in range(seconds // 2):
+            wav.writeframes(chords[idx % len(chords)])
+
+def benchAudio():
+    '''
+        Real-time factor and peak memory of chromagram chord recognition by the audio length.
+    '''
+    import tempfile
+    import tracemalloc
+    from audio_chords import analyzeFile, analyzeFiles
+    from chord_table import getChordTable
+
+    getChordTable()
+    with tempfile.TemporaryDirectory() as directory:
+        for seconds in (60, 600):
+            path = os.path.join(directory, f'{seconds}.wav')
+            writeChordWav(path, seconds)
+            tracemalloc.start()
+            start = time.perf_counter()
+            track = analyzeFile(path)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            names = [segment.name for segment in track if segment.end - segment.start > 1]
+            print(f'{seconds:4d} s audio: {elapsed * 1e3:8.1f} ms ({seconds / elapsed:.0f}x real time), '
+                  f'peak {peak / 2 ** 20:.1f} MiB, {len(track)} segments, {" ".join(names[:4])} ...')
+
+        paths = [os.path.join(directory, f'{idx}.wav') for idx in range(8)]
+        for path in paths:
+            writeChordWav(path, 60)
+        start = time.perf_counter()
+        for _ in analyzeFiles(paths):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f'{len(paths)} files on {os.cpu_count()} processes: {len(paths) * 60 / elapsed:.0f}x real time')
+
+def benchUi():
+    '''
+        Window construction, clicks, reset, mode change and chord identification of ThreeNotes.
+    '''
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from fretboard_state import MUTED
+
+    qtApplication()
+    MainWindow = QtWidgets.QMainWindow()
+    ThreeNotes(MainWindow).checkChord()     # Warm up the chord table and Qt
+    windows = []
+    def construct():
+        MainWindow = QtWidgets.QMainWindow()
+        windows.append((MainWindow, ThreeNotes(MainWindow)))
+    construct_time = bestOf(construct, 5, 3)
+    windows.clear()
+
+    ui = ThreeNotes(MainWindow)
+    point = ui.strings[STRING_NUM - 1][2].point     # Press and release by turns
+    chord_press_time = bestOf(lambda: ui.pointPressEventHelper(point), 200)
+
+    def resetAll():
+        for stringNum in range(1, STRING_NUM + 1):
+            ui.state.press(stringNum, stringNum)
+        ui.state.muted = (1 << STRING_NUM) - 1
+        ui.flushUpdate()
+        start = time.perf_counter()
+        ui.resetEvent()
+        return time.perf_counter() - start
+    reset_time = min(sum(resetAll() for _ in range(50)) / 50 for _ in range(5))
+
+    for _ in list(Mode):        # Build the tables of every mode
+        ui.modeChangeEvent()
+    mode_time = bestOf(ui.modeChangeEvent, 3 * len(Mode))
+
+    ui.modeChangeEvent()        # Note Mode
+    assert(ui.mode == Mode.NOTE)
+    points = [ui.strings[0][fret].point for fret in range(len(NOTES))]
+    note_press_time = bestOf(lambda: [ui.pointPressEventHelper(point) for point in points], 20) / len(points)
+    while ui.mode != Mode.CHORD:       # Back to Chord Mode
+        ui.modeChangeEvent()
+
+    rng = random.Random(0)
+    corpus = [[rng.randint(MUTED, NOTE_PER_STRING) for _ in range(STRING_NUM)] for _ in range(1000)]
+    def checkCorpus():
+        for voicing in corpus:
+            ui.state.setVoicing(voicing)
+            ui.checkChord()
+    check_time = bestOf(checkCorpus, 1) / len(corpus)
+
+    record('ui.construct', construct_time)
+    record('ui.press_chord', chord_press_time)
+    record('ui.press_note', note_press_time)
+    record('ui.reset_all', reset_time)
+    record('ui.mode_change', mode_time)
+    record('ui.check_chord', check_time)
+
+def benchTracing():
+    '''
+        Cost of the instrumentation on checkChord, disabled and enabled.
+    '''
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from fretboard_state import MUTED
+    from instrumentation import tracer
+
+    qtApplication()
+    MainWindow = QtWidgets.QMainWindow()
+    ui = ThreeNotes(MainWindow)
+
+    rng = random.Random(0)
+    corpus = [[rng.randint(MUTED, NOTE_PER_STRING) for _ in range(STRING_NUM)] for _ in range(1000)]
+    def checkCorpus():
+        for voicing in corpus:
+            ui.state.setVoicing(voicing)
+            ui.checkChord()
+    checkCorpus()
+    disabled_time = bestOf(checkCorpus, 1) / len(corpus)
+    tracer.enabled = True
+    enabled_time = bestOf(checkCorpus, 1) / len(corpus)
+    tracer.enabled = False
+    print(f'disabled: {disabled_time * 1e6:8.2f} us/checkChord')
+    print(f'enabled:  {enabled_time * 1e6:8.2f} us/checkChord')
+    print('\n'.join(tracer.summary()))
+    tracer.reset()
+
+def benchBackground():
+    '''
+        GUI thread time of rapid clicks with chord identification in the foreground and on the chord worker.
+    '''
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from chord_table import getChordTable
+    from instrumentation import tracer
+
+    app = qtApplication()
+    getChordTable()
+    for background in (False, True):
+        MainWindow = QtWidgets.QMainWindow()
+        ui = ThreeNotes(MainWindow, background=background)
+        rng = random.Random(0)
+        clicks = [ui.strings[rng.randrange(STRING_NUM)][rng.randrange(5)].point for _ in range(2000)]
+        tracer.enabled = True
+        start = time.perf_counter()
+        for point in clicks:        # A burst of clicks before the event loop runs again
+            ui.pointPressEventHelper(point)
+        click_time = (time.perf_counter() - start) / len(clicks)
+        while ui.chord_worker is not None and ui.chord_worker.depth():
+            app.processEvents()
+        tracer.enabled = False
+        print(f'{"background" if background else "foreground"}: {click_time * 1e6:8.2f} us/click on the GUI thread')
+        if background:
+            latency = tracer.histograms['chord latency']
+            print(f'    latency p50 {latency.percentile(50) * 1e3:.2f} ms, p99 {latency.percentile(99) * 1e3:.2f} ms, '
+                  f'max queue depth {tracer.gauges["chord queue depth"][1]}, '
+                  f'{tracer.counts.get("chord cancelled", 0)} cancelled, {tracer.counts.get("chord stale", 0)} stale, '
+                  f'{tracer.counts.get("chord named", 0) + tracer.counts.get("chord unnamed", 0)} shown')
+            ui.chord_worker.shutdown()
+        tracer.reset()
+
+def benchVoiceLeading():
+    '''
+        Voice leading time by progression length, with the voicings of each chord computed and memoized.
+    '''
+    from voice_leading import voiceLead, chordCandidates
+    from chord_formula import getChordFormulaTable
+
+    getChordFormulaTable()
+    vocabulary = ['C', 'Dm', 'Em', 'F', 'G', 'Am', 'G7', 'Cmaj7', 'Dm7', 'E7', 'A7', 'Bb', 'Fm', 'D', 'C/E', 'Bm7b5']
+    rng = random.Random(0)
+    for length in (4, 8, 16, 32, 64):
+        progression = [rng.choice(vocabulary) for _ in range(length)]
+        chordCandidates.cache_clear()
+        start = time.perf_counter()
+        voiceLead(progression)
+        cold_time = time.perf_counter() - start
+        warm_time = bestOf(lambda: voiceLead(progression), 5)
+        print(f'{length:3d} chords: {cold_time * 1e3:7.1f} ms cold, {warm_time * 1e3:7.1f} ms memoized')
+
+def benchReplay():
+    '''
+        Record a session of random user events, and replay it at maximum speed with the display checked.
+    '''
+    import tempfile
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from session_log import SessionRecorder, readSession, replaySession
+
+    qtApplication()
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'session.tnsl')
+        MainWindow = QtWidgets.QMainWindow()
+        ui = ThreeNotes(MainWindow)
+        ui.recorder = SessionRecorder(path)
+        for _ in range(5000):
+            action = rng.random()
+            if action < 0.75:
+                ui.pointPressEvent(ui.points[rng.randrange(len(ui.points))])(None)
+            elif action < 0.87:
+                ui.checkBoxs[rng.randrange(STRING_NUM)].click()
+            elif action < 0.9:
+                ui.resetButton.click()
+            elif action < 0.92:
+                ui.modeButton.click()
+            elif action < 0.96:
+                ui.undoEvent()
+            else:
+                ui.redoEvent()
+        ui.recorder.close()
+        size = os.path.getsize(path)
+
+        _, tuning, records = readSession(path)
+        MainWindow = QtWidgets.QMainWindow()
+        event_num, mismatches, elapsed = replaySession(ThreeNotes(MainWindow, tuning=tuning), records)
+        print(f'{event_num} events, {size} bytes ({size / event_num:.1f} bytes/event)')
+        print(f'replay: {event_num / elapsed:,.0f} events/s, {len(mismatches)} mismatches')
+
+def benchScale():
+    '''
+        Time of a key change in Scale Mode, cycling every root and scale with the arrow key handler.
+    '''
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from scales import SCALE_NAMES
+
+    app = qtApplication()
+    for painted in (False, True):
+        MainWindow = QtWidgets.QMainWindow()
+        ui = ThreeNotes(MainWindow, painted=painted)
+        while ui.mode != Mode.SCALE:
+            ui.modeButton.click()
+        steps = [(1, 0)] * len(NOTES) + [(0, 1)] * len(SCALE_NAMES)
+        def cycle():
+            for root_step, scale_step in steps:
+                ui.scaleStepEvent(root_step, scale_step)
+            app.processEvents()
+        step_time = bestOf(cycle, 5) / len(steps)
+        name = 'scale_step_painted' if painted else 'scale_step'
+        record(name, step_time)
+
+def benchBoards():
+    '''
+        Time and Python memory of opening 1 to 50 painted boards sharing one board model, against building a model.
+    '''
+    import tracemalloc
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    from board_model import BoardModel
+
+    qtApplication()
+    ThreeNotes(QtWidgets.QMainWindow(), painted=True)     # Warm up Qt and the shared model
+    record('board_model', timeit(BoardModel, 20))
+    for number in (1, 5, 10, 25, 50):
+        boards = []
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(number):
+            MainWindow = QtWidgets.QMainWindow()
+            boards.append((MainWindow, ThreeNotes(MainWindow, painted=True)))
+        elapsed = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f'{number:3d} boards: {elapsed * 1e3:8.1f} ms ({elapsed / number * 1e3:6.2f} ms/board), '
+              f'{memory / 1024:8.1f} KiB Python memory ({memory / number / 1024:6.1f} KiB/board)')
+        if number == 50:
+            record('board_open', elapsed / number)
+        del boards
+
+def benchServer():
+    '''
+        Requests/s and latency of the chord server on a Unix socket, from pipelining keep-alive clients:
+        single voicings mostly answered by the cache, and batches of new voicings identified on the pool.
+    '''
+    import asyncio
+    import subprocess
+    import tempfile
+    from collections import deque
+
+    async def readResponse(reader):
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        return await reader.readexactly(length)
+
+    async def client(path, bodies, depth, latencies):
+        '''
+            Send bodies on one connection with up to depth requests in flight.
+        '''
+        reader, writer = await asyncio.open_unix_connection(path)
+        window = asyncio.Semaphore(depth)
+        sent = deque()
+        async def receive():
+            for _ in bodies:
+                await readResponse(reader)
+                latencies.append(time.perf_counter() - sent.popleft())
+                window.release()
+        receiver = asyncio.ensure_future(receive())
+        for body in bodies:
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(b'POST /identify HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+        await receiver
+        writer.close()
+
+    async def load(path, name, bodies, connections, depth):
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(path, bodies[idx::connections], depth, latencies) for idx in range(connections)))
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        print(f'{name}: {len(bodies) / elapsed:9,.0f} requests/s, p50 {p50 * 1e3:7.2f} ms, p99 {p99 * 1e3:7.2f} ms '
+              f'({connections} connections, {depth} pipelined)')
+        record(f'server_{name}_p99', p99)
+
+    rng = random.Random(0)
+    def voicing():
+        return [rng.randint(-1, NOTE_PER_STRING) for _ in range(STRING_NUM)]
+    common = [voicing() for _ in range(2000)]
+    singles = [json.dumps({'voicing': rng.choice(common)}).encode() for _ in range(20000)]
+    batches = [json.dumps({'voicings': [voicing() for _ in range(1000)]}).encode() for _ in range(64)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'chord.sock')
+        server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chord_server.py'),
+                                   '--unix', path, '--workers', '4'], stderr=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(path):
+                if server.poll() is not None:
+                    raise RuntimeError('The chord server exited')
+                time.sleep(0.05)
+            asyncio.run(load(path, 'single', singles, 8, 16))
+            asyncio.run(load(path, 'batch', batches, 4, 2))
+        finally:
+            server.terminate()
+            server.wait()
+
+def benchKey():
+    '''
+        Key detection of a 100k chord song at once, and appending one chord to it against analyzing the whole song again.
+    '''
+    from key_analysis import KeyTimeline, qualityMasks
+
+    qualityMasks()
+    ## Diatonic progressions leaning on I, IV, V and vi, modulating every 64 chords
+    rng = random.Random(0)
+    qualities = ['', 'm', 'm', '', '7', 'm', 'm7-5']
+    weights = [4, 1, 1, 3, 3, 2, 0.3]
+    chordNames = []
+    for section in range(100000 // 64):
+        tonic = rng.randrange(len(NOTES))
+        for _ in range(64):
+            degree = rng.choices(range(7), weights)[0]
+            chordNames.append(NOTES[(tonic + (0, 2, 4, 5, 7, 9, 11)[degree]) % len(NOTES)] + qualities[degree])
+
+    def analyzeSong():
+        KeyTimeline().extend(chordNames)
+    song_time = bestOf(analyzeSong, 1, 3)
+    print(f'{len(chordNames)} chords: {song_time * 1e3:.1f} ms, {len(chordNames) / song_time:,.0f} chords/s')
+    record('key_song', song_time)
+    timeline = KeyTimeline()
+    timeline.extend(chordNames)
+    record('key_append', bestOf(lambda: timeline.append(rng.choice(chordNames)), 1000))
+
+def compareBaseline(path, tolerance):
+    '''
+        Compare the results with a baseline results file, return the names slower than the tolerance.
+    '''
+    with open(path, 'r') as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    for name, seconds in RESULTS.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name]
+        print(f'{name:<24}{ratio:8.2f}x of baseline')
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+BENCHMARKS = {
+    'chord_table': benchChordTable,
+    'ranking': benchRanking,
+    'batch': benchBatch,
+    'enumerate': benchEnumerate,
+    'voicing_index': benchVoicingIndex,
+    'fretboard': benchFretboard,
+    'labels': benchLabels,
+    'midi': benchMidi,
+    'audio': benchAudio,
+    'ui': benchUi,
+    'tracing': benchTracing,
+    'background': benchBackground,
+    'voice_leading': benchVoiceLeading,
+    'replay': benchReplay,
+    'scale': benchScale,
+    'boards': benchBoards,
+    'server': benchServer,
+    'key': benchKey,
+}
+## Slow checks, only run when named
+CHECKS = {
+    'chord_table_verify': verifyChordTable,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Micro-benchmarks of ThreeNotes.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run, default to all of BENCHMARKS')
+    parser.add_argument('--output', default=None, help='write the recorded results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='fail if slower than the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed slowdown against the baseline')
+    args = parser.parse_args()
+
+    for name in args.names or list(BENCHMARKS):
+        print(f'## {name}')
+        {**BENCHMARKS, **CHECKS}[name]()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'platform': sys.platform, 'results': RESULTS}, f, indent=2)
+    if args.baseline:
+        print('## baseline')
+        regressions = compareBaseline(args.baseline, args.tolerance)
+        if regressions:
+            print(f'REGRESSION: {", ".join(regressions)} slower than {1 + args.tolerance:.2f}x of {args.baseline}', file=sys.stderr)
+            sys.exit(1)
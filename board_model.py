@@ -0,0 +1,78 @@
+'''
+    The immutable model of a fretboard: geometry, the pitch of every point and the scaled dots,
+    built once per tuning and shared by every board of that tuning.
+
+    A board only holds its playing state and widgets, so opening another board of a tuning
+    already shown costs no geometry, pitch or pixmap work.
+'''
+from PyQt5 import QtCore, QtGui
+from fretboard_geometry import STANDARD_TUNING, horizonLineRects, verticalLineRects, pressPointRects, pressPointPitches
+from note_index import NoteIndex
+from pitch import parsePitch
+from const import *
+
+class BoardModel:
+    '''
+        Rects of the lines and points in the coordinates of the central widget, the bounds of the board,
+        the pitch of every point and its note index.
+    '''
+    __slots__ = ('tuning', 'horizon_rects', 'vertical_rects', 'point_rects', 'bounds', 'local_point_rects',
+                 'line_lefts', 'point_lefts', 'point_pitches', 'note_index', 'dots')
+
+    def __init__(self, tuning: tuple = STANDARD_TUNING):
+        init = super().__setattr__
+        init('tuning', tuple(tuning))
+        init('horizon_rects', tuple(QtCore.QRect(*rect) for rect in horizonLineRects()))
+        init('vertical_rects', tuple(QtCore.QRect(*rect) for rect in verticalLineRects()))
+        init('point_rects', tuple(QtCore.QRect(*rect) for rect in pressPointRects()))
+        bounds = QtCore.QRect()
+        for rect in self.horizon_rects + self.vertical_rects + self.point_rects:
+            bounds = bounds.united(rect)
+        init('bounds', bounds)
+        ## Point rects in the coordinates of the painted board, for repainting one point
+        init('local_point_rects', tuple(rect.translated(-bounds.topLeft()) for rect in self.point_rects))
+        ## Left edge of every line and point of each string, for bisecting the clicked one
+        init('line_lefts', tuple(tuple(rect.left() for rect in self.stringItems(self.horizon_rects, idx)) for idx in range(STRING_NUM)))
+        init('point_lefts', tuple(tuple(rect.left() for rect in self.stringItems(self.point_rects, idx)) for idx in range(STRING_NUM)))
+        init('point_pitches', tuple(pressPointPitches(self.tuning)))
+        init('note_index', NoteIndex(self.point_pitches))
+        ## Dot pixmaps scaled to the point size, by the cache key of the source pixmap
+        init('dots', dict())
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is shared by boards and cannot be changed')
+
+    @staticmethod
+    def stringItems(items, stringIdx):
+        return items[stringIdx * NOTE_PER_STRING:(stringIdx + 1) * NOTE_PER_STRING]
+
+    def scaledDot(self, pixmap: QtGui.QPixmap):
+        '''
+            A dot pixmap scaled to the point size, scaled once per pixmap for every board.
+        '''
+        key = pixmap.cacheKey()
+        if key not in self.dots:
+            self.dots[key] = pixmap.scaled(ConstPressPoint.width, ConstPressPoint.height,
+                                           QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+        return self.dots[key]
+
+_board_models = dict()
+
+def boardModel(tuning: tuple = None):
+    '''
+        The shared model of a tuning (open string pitch from string one), standard tuning by default.
+    '''
+    tuning = STANDARD_TUNING if tuning is None else tuple(tuning)
+    if tuning not in _board_models:
+        _board_models[tuning] = BoardModel(tuning)
+    return _board_models[tuning]
+
+def parseTuning(text: str):
+    '''
+        Parse a tuning written from string six to string one like a tab, e.g. "D2 A2 D3 G3 B3 E4",
+        into the open string pitches from string one.
+    '''
+    tokens = text.split()
+    if len(tokens) != STRING_NUM:
+        raise ValueError(f'Tuning "{text}" should have {STRING_NUM} strings')
+    return tuple(parsePitch(token) for token in reversed(tokens))
@@ -0,0 +1,57 @@
+'''
+    Headless chord analysis, without Qt.
+
+    A voicing is a fret per string, indexed from string one to string six
+    (the order of OPEN_STRING_PITCH), with MUTED for a muted string and 0 for open string.
+
+    Usage: python chord_analyzer.py x32010 320003 ...
+'''
+import sys
+import numpy as np
+from chord_table import getChordTable, PITCH_CLASS_NUM
+from pitch import OPEN_STRING_PITCH, voicingPitches
+from const import *
+
+MUTED = -1
+
+def parseVoicing(text: str):
+    '''
+        Parse a voicing written from string six to string one, e.g. "x32010" or "x 3 2 0 1 0".
+    '''
+    frets = text.split() if ' ' in text.strip() else list(text.strip())
+    if len(frets) != STRING_NUM:
+        raise ValueError(f'Voicing "{text}" should have {STRING_NUM} strings')
+    voicing = [MUTED if fret.lower() == 'x' else int(fret) for fret in reversed(frets)]
+    for fret in voicing:
+        if not MUTED <= fret <= NOTE_PER_STRING:
+            raise ValueError(f'Fret {fret} is out of the fretboard')
+    return voicing
+
+def identify(voicing, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        Identify the chord of a single voicing on tuning (open string pitch from string one), the lowest pitch as bass.
+    '''
+    return getChordTable().lookupPitches(voicingPitches(voicing, tuning))
+
+def identifyBatch(voicings, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        Identify the chords of an (N, STRING_NUM) integer array of voicings on tuning, the lowest pitch as bass.
+        The pitch classes, bass and compound tensions of every voicing are found in one vectorized pass,
+        and named by array lookups of the chord table. Return an array of N chord names, '' for no chord.
+    '''
+    voicings = np.asarray(voicings)
+    if voicings.ndim != 2 or voicings.shape[1] != STRING_NUM:
+        raise ValueError(f'Voicings should be an (N, {STRING_NUM}) array, got {voicings.shape}')
+    sounding = voicings != MUTED
+    pitches = np.asarray(tuning) + voicings
+    bits = np.where(sounding, 1 << pitches % PITCH_CLASS_NUM, 0)
+    masks = np.bitwise_or.reduce(bits, axis=1)
+    bass = np.where(sounding, pitches, np.iinfo(pitches.dtype).max).min(axis=1)
+    ## Pitch classes sounding only over an octave above the bass
+    within = np.bitwise_or.reduce(np.where(pitches - bass[:, None] < PITCH_CLASS_NUM, bits, 0), axis=1)
+    return getChordTable().lookupVoicedBatch(masks, bass % PITCH_CLASS_NUM, masks & ~within)
+
+if __name__ == '__main__':
+    for text in sys.argv[1:] or sys.stdin.read().split('\n'):
+        if text.strip():
+            print(text.strip(), identify(parseVoicing(text)))
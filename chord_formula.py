@@ -0,0 +1,74 @@
+'''
+    Chord formula table: chord name to its component notes, for looking chords up by name.
+'''
+from bisect import bisect_left
+from const import *
+
+## Flat spellings of roots accepted besides NOTES
+FLAT_NOTES = {'Db': 'C#', 'Eb': 'D#', 'Gb': 'F#', 'Ab': 'G#', 'Bb': 'A#'}
+
+def noteClass(note: str):
+    '''
+        The pitch class of a spelled note, with any sharps or flats, e.g. "Db", "Fb" or "C##".
+    '''
+    return (NOTES.index(note[0]) + note.count('#') - note.count('b')) % len(NOTES)
+
+class ChordFormulaTable:
+    '''
+        Component notes and pitch-class mask of every root with every pychord quality,
+        with sorted names for incremental completion.
+    '''
+    def __init__(self):
+        from pychord import QualityManager      # Imported on first use, it is slow to import
+        self.formulas = dict()
+        for root in NOTES + list(FLAT_NOTES):
+            root_class = NOTES.index(FLAT_NOTES.get(root, root))
+            for quality_name, quality in QualityManager().get_qualities().items():
+                try:
+                    notes = quality.get_components(root, visible=True)
+                except ValueError:      # Too many accidentals to spell
+                    notes = [NOTES[(root_class + i) % len(NOTES)] for i in quality.components]
+                mask = 0
+                for interval in quality.components:
+                    mask |= 1 << (root_class + interval) % len(NOTES)
+                self.formulas[f'{root}{quality_name}'] = (notes, mask)
+        self.names = sorted(self.formulas)
+
+    def lookup(self, chordName: str):
+        '''
+            The (component notes, pitch-class mask) of a chord name, with "/bass" if slash chord.
+            Return None for unknown chord.
+        '''
+        chordName, _, bass = chordName.strip().partition('/')
+        formula = self.formulas.get(chordName)
+        if formula is None:
+            return None
+        if not bass:
+            return formula
+        bass_note = FLAT_NOTES.get(bass, bass)
+        if bass_note not in NOTES:
+            return None
+        notes, mask = formula
+        bass_class = NOTES.index(bass_note)
+        return [bass] + [note for note in notes if noteClass(note) != bass_class], mask | 1 << bass_class
+
+    def complete(self, prefix: str):
+        '''
+            The chord names starting with prefix.
+        '''
+        start = bisect_left(self.names, prefix)
+        end = start
+        while end < len(self.names) and self.names[end].startswith(prefix):
+            end += 1
+        return self.names[start:end]
+
+_chord_formula_table = None
+
+def getChordFormulaTable():
+    '''
+        The shared chord formula table, built on first use.
+    '''
+    global _chord_formula_table
+    if _chord_formula_table is None:
+        _chord_formula_table = ChordFormulaTable()
+    return _chord_formula_table
@@ -0,0 +1,105 @@
+'''
+    Ranked interpretations of a pitch-class set: root position, inversions, slash chords and rootless chords.
+
+    Every root is tried by rotating the 12-bit mask, so the bass needs not be the root
+    and open strings need not be muted. Qualities are found like the chord table's voiced names,
+    so C D E G is "Cadd2" and C E G D5 is "Cadd9".
+'''
+from collections import namedtuple
+from chord_table import PITCH_CLASS_NUM, MASK_NUM, TENSIONS, SIMPLE_ADDS, voicedQualityIndex
+from pitch import pitchClassMask, compoundMask
+from const import *
+
+ROOT_POSITION, INVERSION, SLASH, ROOTLESS = 'root position', 'inversion', 'slash', 'rootless'
+## Interpretations of a kind earlier here rank first
+KIND_ORDER = {ROOT_POSITION: 0, INVERSION: 1, SLASH: 2, ROOTLESS: 3}
+## Fewest notes of a set to be read as a slash chord or a rootless chord
+MIN_RANKED_NOTES = 3
+
+Interpretation = namedtuple('Interpretation', ['name', 'kind', 'root'])
+
+_qualities = None
+_tension_bits = None
+
+def qualityTable():
+    '''
+        The (quality name, pychord order) of every key of voicedQualityIndex(), None for no quality:
+        the interval mask above the root with the bits of the TENSIONS sounding an octave higher.
+        The first quality in pychord's order wins, like the chord table.
+    '''
+    global _qualities
+    if _qualities is None:
+        names, index = voicedQualityIndex()
+        _qualities = [None if order < 0 else (names[order], order) for order in index.tolist()]
+    return _qualities
+
+def tensionBits():
+    '''
+        The bits of the TENSIONS set in every interval mask, as keyed in qualityTable().
+    '''
+    global _tension_bits
+    if _tension_bits is None:
+        _tension_bits = [sum((intervals >> tension & 1) << idx for idx, tension in enumerate(TENSIONS))
+                         for intervals in range(MASK_NUM)]
+    return _tension_bits
+
+def rotate(mask: int, root: int):
+    '''
+        Rotate a pitch-class mask so that pitch class root is bit 0.
+    '''
+    return (mask >> root | mask << (PITCH_CLASS_NUM - root)) & (MASK_NUM - 1)
+
+def voicedQuality(mask: int, compound: int, root: int):
+    '''
+        The (quality name, pychord order) of pitch-class set "mask" above root, by the same steps as nameVoiced():
+        the tensions of "compound" raised an octave, then pitch classes, then every tension raised
+        with an added 9th or 11th named as 2nd or 4th. None for no quality.
+    '''
+    qualities, tension_bits = qualityTable(), tensionBits()
+    intervals = rotate(mask, root)
+    key = intervals << len(TENSIONS)
+    quality = qualities[key | tension_bits[rotate(compound, root)]] or qualities[key]
+    if quality is None:
+        quality = qualities[key | tension_bits[intervals]]
+        if quality is not None:
+            name, order = quality
+            for added, simple in SIMPLE_ADDS:
+                if name.endswith(added):
+                    quality = (name[:-len(added)] + simple, order)
+    return quality
+
+def rankChord(mask: int, bass: int, compound: int = 0):
+    '''
+        The interpretations of pitch-class set "mask" with bass pitch class "bass", best first,
+        where the pitch classes of mask "compound" only sound over an octave above the bass.
+    '''
+    note_num = bin(mask).count('1')
+    upper = mask & ~(1 << bass)     # Without the bass, for slash chords
+    ranked = []
+    for root in range(PITCH_CLASS_NUM):
+        if mask >> root & 1:
+            quality = voicedQuality(mask, compound, root)
+            if quality is not None:
+                if root == bass:
+                    ranked.append((ROOT_POSITION, quality, f'{NOTES[root]}{quality[0]}', root))
+                else:
+                    ranked.append((INVERSION, quality, f'{NOTES[root]}{quality[0]}/{NOTES[bass]}', root))
+            if upper >> root & 1 and note_num > MIN_RANKED_NOTES:
+                quality = voicedQuality(upper, compound, root)
+                if quality is not None:
+                    ranked.append((SLASH, quality, f'{NOTES[root]}{quality[0]}/{NOTES[bass]}', root))
+        elif note_num >= MIN_RANKED_NOTES:
+            quality = voicedQuality(mask | 1 << root, compound, root)
+            if quality is not None:
+                ranked.append((ROOTLESS, quality, f'{NOTES[root]}{quality[0]}', root))
+    ## Same kind in pychord's order
+    ranked.sort(key=lambda item: (KIND_ORDER[item[0]], item[1][1]))
+    return [Interpretation(name, kind, root) for kind, _, name, root in ranked]
+
+def rankPitches(pitches):
+    '''
+        The interpretations of the pitches now playing, the lowest pitch as bass, [] for no pitch.
+    '''
+    if not pitches:
+        return []
+    return rankChord(pitchClassMask(pitches), min(pitches) % PITCH_CLASS_NUM, compoundMask(pitches))
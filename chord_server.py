@@ -0,0 +1,242 @@
+'''
+    Headless chord identification service over HTTP, on localhost or a Unix socket.
+
+    POST /identify with {"voicing": "x32010"} answers {"chord": "C"}, and with
+    {"voicings": ["x32010", [0, 1, 0, 2, 3, -1], ...]} answers {"chords": ["C", "C", ...]}.
+    A voicing is written from string six to string one like chord_analyzer.parseVoicing,
+    or is a list of frets from string one with -1 for muted string. GET /stats answers the cache counts.
+
+    Chords are named like ThreeNotes.checkChord, with the lowest pitch as bass.
+    Connections are kept alive and may pipeline requests; answers keep the order of the requests.
+    Voicings are cached, and large batches of uncached voicings are identified on a process pool.
+
+    Usage: python chord_server.py [--host 127.0.0.1] [--port 8765] [--unix PATH] [--workers N]
+'''
+import os
+import sys
+import json
+import signal
+import asyncio
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from chord_analyzer import parseVoicing, identify, identifyBatch, MUTED
+from chord_table import getChordTable
+from const import *
+
+CACHE_SIZE = 1 << 16        # Voicings whose chord is cached
+POOL_BATCH = 512        # Fewest uncached voicings of a batch sent to the process pool
+PIPELINE_DEPTH = 64     # Requests of a connection in flight before reading more
+MAX_BODY = 1 << 24
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large'}
+
+class RequestError(Exception):
+    '''
+        A request answered with an HTTP error status.
+    '''
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def voicingKey(voicing):
+    '''
+        The fret tuple from string one of a voicing given as text or as a list of frets.
+    '''
+    if isinstance(voicing, str):
+        return tuple(parseVoicing(voicing))
+    if not isinstance(voicing, list) or len(voicing) != STRING_NUM:
+        raise ValueError(f'Voicing {voicing!r} should have {STRING_NUM} strings')
+    for fret in voicing:
+        if type(fret) is not int or not MUTED <= fret <= NOTE_PER_STRING:       # JSON true / false are not frets
+            raise ValueError(f'Fret {fret!r} is out of the fretboard')
+    return tuple(voicing)
+
+def identifyKeys(keys: list):
+    '''
+        The chord names of fret tuples, in one vectorized pass, run on the process pool.
+    '''
+    return identifyBatch(keys).tolist()
+
+class ChordService:
+    '''
+        Answer the HTTP requests of each connection in order, identifying chords through an LRU cache.
+    '''
+    def __init__(self, workers: int = None, cache_size: int = CACHE_SIZE):
+        getChordTable()     # Built before the first request
+        self.pool = ProcessPoolExecutor(workers or os.cpu_count(), initializer=getChordTable)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self.pool_batches = 0
+
+    async def identify(self, keys: list):
+        '''
+            The chord names of fret tuples, the uncached ones identified inline or on the pool by their number.
+        '''
+        names = [None] * len(keys)
+        missing = dict()        # Uncached voicing to its indices in keys
+        for idx, key in enumerate(keys):
+            name = self.cache.get(key)
+            if name is None:
+                missing.setdefault(key, []).append(idx)
+            else:
+                self.cache.move_to_end(key)
+                names[idx] = name
+        self.hits += len(keys) - sum(len(indices) for indices in missing.values())
+        self.misses += len(missing)
+        if missing:
+            uncached = list(missing)
+            if len(uncached) >= POOL_BATCH:
+                self.pool_batches += 1
+                found = await asyncio.get_running_loop().run_in_executor(self.pool, identifyKeys, uncached)
+            else:       # A table lookup per voicing
+                found = [identify(key) for key in uncached]
+            for key, name in zip(uncached, found):
+                for idx in missing[key]:
+                    names[idx] = name
+                self.cache[key] = name
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return names
+
+    async def answer(self, method: str, path: str, body: bytes):
+        '''
+            The (status, JSON object) answering a request.
+        '''
+        self.requests += 1
+        if path == '/stats':
+            return 200, {'requests': self.requests, 'hits': self.hits, 'misses': self.misses,
+                         'cached': len(self.cache), 'pool_batches': self.pool_batches}
+        if path != '/identify':
+            raise RequestError(404, f'Unknown path {path}')
+        if method != 'POST':
+            raise RequestError(405, 'Use POST')
+        try:
+            request = json.loads(body)
+            if 'voicings' in request:
+                return 200, {'chords': await self.identify([voicingKey(voicing) for voicing in request['voicings']])}
+            if 'voicing' in request:
+                return 200, {'chord': (await self.identify([voicingKey(request['voicing'])]))[0]}
+        except (ValueError, TypeError, AttributeError) as e:       # Bad JSON or voicing
+            raise RequestError(400, str(e))
+        raise RequestError(400, 'Give "voicing" or "voicings"')
+
+    async def respond(self, method: str, path: str, body: bytes, keep_alive: bool):
+        '''
+            The bytes of the HTTP response of a request.
+        '''
+        try:
+            status, result = await self.answer(method, path, body)
+        except RequestError as e:
+            status, result = e.status, {'error': str(e)}
+        return httpResponse(status, result, keep_alive)
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        '''
+            Read the requests of a connection and answer them in order, while later ones are read and handled.
+        '''
+        responses = asyncio.Queue(PIPELINE_DEPTH)
+        sender = asyncio.ensure_future(self.send(responses, writer))
+        try:
+            keep_alive = True
+            while keep_alive:
+                request = await readRequest(reader)
+                if request is None:
+                    break
+                method, path, headers, body, keep_alive = request
+                await responses.put(asyncio.ensure_future(self.respond(method, path, body, keep_alive)))
+        except RequestError as e:       # Unreadable request, answer and close
+            response = asyncio.get_running_loop().create_future()
+            response.set_result(httpResponse(e.status, {'error': str(e)}, False))
+            await responses.put(response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        await responses.put(None)
+        await sender
+
+    @staticmethod
+    async def send(responses: asyncio.Queue, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                response = await responses.get()
+                if response is None:
+                    break
+                writer.write(await response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+def httpResponse(status: int, result, keep_alive: bool):
+    '''
+        The bytes of an HTTP response with a JSON body.
+    '''
+    data = json.dumps(result).encode()
+    head = (f'HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(data)}\r\nConnection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+    return head.encode() + data
+
+async def readRequest(reader: asyncio.StreamReader):
+    '''
+        The (method, path, headers, body, keep alive) of the next request, None at the end of the connection.
+    '''
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, path, version = line.decode('latin-1').split()
+    except ValueError:
+        raise RequestError(400, 'Bad request line')
+    headers = dict()
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get('content-length', '0')
+    if not length.isdigit():
+        raise RequestError(400, 'Bad Content-Length')
+    length = int(length)
+    if length > MAX_BODY:
+        raise RequestError(413, f'Body over {MAX_BODY} bytes')
+    body = await reader.readexactly(length) if length else b''
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return method, path, headers, body, keep_alive
+
+async def startServer(service: ChordService, host: str = '127.0.0.1', port: int = 8765, unix: str = None):
+    '''
+        Listen on a Unix socket if given, otherwise on host:port.
+    '''
+    if unix:
+        return await asyncio.start_unix_server(service.serve, unix)
+    return await asyncio.start_server(service.serve, host, port)
+
+async def main(args):
+    service = ChordService(args.workers)
+    server = await startServer(service, args.host, args.port, args.unix)
+    print(f'Serving on {args.unix or f"http://{args.host}:{args.port}"}', file=sys.stderr, flush=True)
+    ## Stop on SIGINT / SIGTERM, shutting the pool down with the server
+    stop = asyncio.get_running_loop().create_future()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, lambda: stop.done() or stop.set_result(None))
+    try:
+        async with server:
+            await stop
+    finally:
+        service.shutdown()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve chord identification over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='listen on a Unix socket at this path instead')
+    parser.add_argument('--workers', type=int, help='processes of the pool, the CPU count by default')
+    asyncio.run(main(parser.parse_args()))
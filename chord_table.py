@@ -0,0 +1,207 @@
+import json
+from pitch import pitchClassMask, compoundMask
+from const import *
+
+PITCH_CLASS_NUM = len(NOTES)
+MASK_NUM = 1 << PITCH_CLASS_NUM     # 4096 possible pitch-class sets
+## Intervals above the root read as 9th, 11th and 13th when they sound over an octave above the bass
+TENSIONS = (2, 5, 9)
+## Added tensions sounding inside the octave of the bass are 2nd and 4th
+SIMPLE_ADDS = (('add9', 'add2'), ('add11', 'add4'))
+
+_component_qualities = None
+
+def componentQualities():
+    '''
+        The quality name of the intervals of every quality registered in pychord, e.g. (0, 4, 7, 14) is "add9".
+        The first quality in pychord's order wins, like find_quality_from_components().
+    '''
+    global _component_qualities
+    if _component_qualities is None:
+        from pychord import QualityManager      # Imported on first use, it is slow to import
+        _component_qualities = dict()
+        for name, quality in QualityManager().get_qualities().items():
+            _component_qualities.setdefault(tuple(quality.components), name)
+    return _component_qualities
+
+def voicedQualityIndex():
+    '''
+        The quality names, and the quality number of every interval mask above the root with the bits of
+        the TENSIONS sounding an octave higher, (MASK_NUM << len(TENSIONS)) numbers and -1 for no quality.
+        Only the qualities nameVoiced() can find are numbered, in componentQualities() order.
+    '''
+    import numpy as np      # Imported on first use, the GUI starts without it
+    names = []
+    index = np.full(MASK_NUM << len(TENSIONS), -1, dtype=np.int16)
+    for components, name in componentQualities().items():
+        classes = [interval % PITCH_CLASS_NUM for interval in components]
+        if (list(components) != sorted(components) or len(set(classes)) != len(classes)
+                or any(interval >= PITCH_CLASS_NUM and interval - PITCH_CLASS_NUM not in TENSIONS for interval in components)):
+            continue
+        key = sum(1 << interval for interval in classes) << len(TENSIONS)
+        key |= sum(1 << idx for idx, tension in enumerate(TENSIONS) if tension + PITCH_CLASS_NUM in components)
+        if index[key] < 0:
+            index[key] = len(names)
+            names.append(name)
+    return names, index
+
+class ChordTable:
+    '''
+        Chord names keyed by a 12-bit pitch-class mask plus the bass pitch class.
+
+        Bit i of the mask is set when NOTES[i] is playing. The names are the same
+        as find_chords_from_notes() returns for the notes ordered from the bass.
+
+        Names of voiced pitches, telling 9ths from 2nds, are found on first lookup and kept.
+    '''
+    def __init__(self, names: list = None):
+        if names is None:
+            names = self.build()
+        assert(len(names) == MASK_NUM * PITCH_CLASS_NUM)
+        self.names = names
+        self.voiced = dict()
+        self.voiced_index = None
+
+    @staticmethod
+    def build():
+        '''
+            Build the whole table from the qualities registered in pychord.
+        '''
+        qualities = componentQualities()
+        names = [''] * (MASK_NUM * PITCH_CLASS_NUM)
+        for mask in range(1, MASK_NUM):
+            notes = [note for note in range(PITCH_CLASS_NUM) if mask >> note & 1]
+            ## Quality of every rotation of the notes, rooted at each note
+            rotations = []
+            for idx, root in enumerate(notes):
+                positions = tuple((note - root) % PITCH_CLASS_NUM for note in notes[idx:] + notes[:idx])
+                rotations.append((root, qualities.get(positions)))
+            for idx, bass in enumerate(notes):
+                ## Try every rotation from the bass upward, as find_chords_from_notes() does
+                for root, quality in rotations[idx:] + rotations[:idx]:
+                    if quality is None:
+                        continue
+                    if root == bass:
+                        names[mask * PITCH_CLASS_NUM + bass] = f'{NOTES[root]}{quality}'
+                    else:
+                        names[mask * PITCH_CLASS_NUM + bass] = f'{NOTES[root]}{quality}/{NOTES[bass]}'
+                    break
+        return names
+
+    @classmethod
+    def load(cls, path):
+        '''
+            Load a table saved by save().
+        '''
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def save(self, path):
+        '''
+            Save the table, so it can be loaded without pychord's quality scan.
+        '''
+        with open(path, 'w') as f:
+            json.dump(self.names, f, separators=(',', ':'))
+
+    def lookup(self, mask: int, bass: int):
+        '''
+            Get the chord name of pitch-class set "mask" with bass pitch class "bass".
+        '''
+        return self.names[mask * PITCH_CLASS_NUM + bass]
+
+    def lookupPitches(self, pitches):
+        '''
+            Get the chord name of the pitches now playing, the lowest pitch as bass.
+        '''
+        if not pitches:
+            return ''
+        return self.lookupVoiced(pitchClassMask(pitches), min(pitches) % PITCH_CLASS_NUM, compoundMask(pitches))
+
+    def lookupVoiced(self, mask: int, bass: int, compound: int):
+        '''
+            Get the chord name of pitch-class set "mask" with bass pitch class "bass",
+            where the pitch classes of mask "compound" only sound over an octave above the bass.
+        '''
+        key = (mask * PITCH_CLASS_NUM + bass) << PITCH_CLASS_NUM | compound
+        name = self.voiced.get(key)
+        if name is None:
+            name = self.voiced[key] = self.nameVoiced(mask, bass, compound)
+        return name
+
+    @staticmethod
+    def nameVoiced(mask: int, bass: int, compound: int):
+        '''
+            Try every root from the bass upward, by the real intervals of the tensions (C E G D5 is "Cadd9"),
+            then by pitch classes, then with the tensions raised an octave and an added 9th or 11th named
+            as 2nd or 4th (C D E G is "Cadd2").
+        '''
+        qualities = componentQualities()
+        notes = [note for note in range(PITCH_CLASS_NUM) if mask >> note & 1]
+        start = notes.index(bass)
+        for root in notes[start:] + notes[:start]:
+            intervals = [(note - root) % PITCH_CLASS_NUM for note in notes]
+            quality = (qualities.get(tuple(sorted(interval + PITCH_CLASS_NUM if interval in TENSIONS and compound >> note & 1 else interval
+                                                  for interval, note in zip(intervals, notes))))
+                       or qualities.get(tuple(sorted(intervals))))
+            if quality is None:
+                quality = qualities.get(tuple(sorted(interval + PITCH_CLASS_NUM if interval in TENSIONS else interval for interval in intervals)))
+                if quality is None:
+                    continue
+                for added, simple in SIMPLE_ADDS:
+                    if quality.endswith(added):
+                        quality = quality[:-len(added)] + simple
+            if root == bass:
+                return f'{NOTES[root]}{quality}'
+            return f'{NOTES[root]}{quality}/{NOTES[bass]}'
+        return ''
+
+    def lookupVoicedBatch(self, masks, basses, compounds):
+        '''
+            Get the chord names of arrays of pitch-class masks, bass pitch classes and compound masks
+            like lookupVoiced(), by array lookups of the voiced quality index for every root at once.
+            Return an array of chord names, '' for no chord.
+        '''
+        import numpy as np
+        if self.voiced_index is None:
+            qualities, index = voicedQualityIndex()
+            simple = []
+            for quality in qualities:
+                for added, renamed in SIMPLE_ADDS:
+                    if quality.endswith(added):
+                        quality = quality[:-len(added)] + renamed
+                simple.append(quality)
+            ## Name of (quality number * 12 + root) * 12 + bass, the add2 / add4 qualities after the others, '' last
+            names = [f'{NOTES[root]}{quality}' if root == bass else f'{NOTES[root]}{quality}/{NOTES[bass]}'
+                     for quality in qualities + simple for root in range(PITCH_CLASS_NUM) for bass in range(PITCH_CLASS_NUM)]
+            self.voiced_index = (index, len(qualities), np.array(names + [''], dtype=object))
+        index, quality_num, names = self.voiced_index
+
+        masks, basses, compounds = (np.asarray(array, dtype=np.int64) for array in (masks, basses, compounds))
+        full = MASK_NUM - 1
+        chosen = np.full(masks.shape, -1, dtype=np.int64)
+        ## Every root from the bass upward, the first with a quality names the chord
+        for step in range(PITCH_CLASS_NUM):
+            roots = (basses + step) % PITCH_CLASS_NUM
+            intervals = (masks >> roots | masks << (PITCH_CLASS_NUM - roots)) & full
+            raised = (compounds >> roots | compounds << (PITCH_CLASS_NUM - roots)) & full
+            keys = intervals << len(TENSIONS)
+            raised_bits = sum((raised >> tension & 1) << idx for idx, tension in enumerate(TENSIONS))
+            tension_bits = sum((intervals >> tension & 1) << idx for idx, tension in enumerate(TENSIONS))
+            quality = index[keys | raised_bits]
+            quality = np.where(quality < 0, index[keys], quality)
+            forced = index[keys | tension_bits]
+            quality = np.where(quality < 0, np.where(forced < 0, -1, forced + quality_num), quality)
+            found = (chosen < 0) & (masks >> roots & 1 == 1) & (quality >= 0)
+            chosen = np.where(found, (quality * PITCH_CLASS_NUM + roots) * PITCH_CLASS_NUM + basses, chosen)
+        return names[np.where(chosen < 0, len(names) - 1, chosen)]
+
+_chord_table = None
+
+def getChordTable():
+    '''
+        The shared chord table, built on first use.
+    '''
+    global _chord_table
+    if _chord_table is None:
+        _chord_table = ChordTable()
+    return _chord_table
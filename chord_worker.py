@@ -0,0 +1,93 @@
+'''
+    Chord identification off the GUI thread, showing only the answer of the newest state.
+'''
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5 import QtCore
+from chord_table import getChordTable
+from chord_ranking import rankPitches
+from instrumentation import tracer
+
+def identifyChord(pitches: list):
+    '''
+        The chord name of the pitches, the lowest as bass, and its ranked interpretations,
+        '' if all strings are muted.
+    '''
+    if not pitches:
+        return '', []
+    return getChordTable().lookupPitches(pitches), rankPitches(pitches)
+
+class ChordWorker(QtCore.QObject):
+    '''
+        Identify chords on a worker pool. Every submission is a new generation, and results of
+        older generations are dropped, so a burst of clicks shows only the last chord.
+
+        Records the "chord queue depth" gauge and the "chord latency" from submission to answer.
+    '''
+    identified = QtCore.pyqtSignal(str, list)
+    unidentified = QtCore.pyqtSignal(str)      # The error of an identification that raised
+    done = QtCore.pyqtSignal(int, str, list)        # Emitted on the worker thread, queued to the GUI thread
+    failed = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, workers: int = 1):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chord')
+        self.generation = 0
+        ## Submission time of the generations not answered yet
+        self.pending = dict()
+        self.done.connect(self.answer)
+        self.failed.connect(self.fail)
+
+    def submit(self, pitches: list):
+        self.generation += 1
+        generation = self.generation
+        ## Superseded requests not started yet are not needed any more
+        for old, (future, _) in list(self.pending.items()):
+            if future.cancel():
+                del self.pending[old]
+                tracer.count('chord cancelled')
+        future = self.executor.submit(identifyChord, pitches)
+        self.pending[generation] = (future, time.perf_counter())
+        tracer.gauge('chord queue depth', len(self.pending))
+        future.add_done_callback(lambda future: self.finished(generation, future))
+
+    def finished(self, generation: int, future):
+        '''
+            Pass the answer or the error of a generation to the GUI thread, on the worker thread.
+        '''
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(generation, repr(error))
+            return
+        self.done.emit(generation, *future.result())
+
+    def answer(self, generation: int, chordName: str, interpretations: list):
+        try:
+            _, submitted = self.pending[generation]
+            if tracer.enabled:
+                tracer.observe('chord latency', time.perf_counter() - submitted)
+            if generation != self.generation:
+                tracer.count('chord stale')
+                return
+            self.identified.emit(chordName, interpretations)
+        finally:
+            self.pending.pop(generation, None)
+
+    def fail(self, generation: int, error: str):
+        '''
+            Drop a generation whose identification raised, keeping the chord shown, and report the error.
+        '''
+        self.pending.pop(generation, None)
+        tracer.count('chord failed')
+        self.unidentified.emit(error)
+
+    def depth(self):
+        '''
+            Number of submissions not answered yet.
+        '''
+        return len(self.pending)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
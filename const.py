@@ -23,9 +23,15 @@ NOTES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
 class Mode(Enum):
     CHORD = 'Chord Mode'
     NOTE = 'Note Mode'
+    LOOKUP = 'Lookup Mode'
+    SCALE = 'Scale Mode'
 
 ######################### UI #########################
 WINDOW_SIZE = (1150, 600)
+CHORD_TEXT_CACHE_SIZE = 64
+CHORD_CANDIDATE_NUM = 8
+## Press point colors of the scale degrees 1 to 7 in Scale Mode
+DEGREE_COLORS = {1: '#d03030', 2: '#e08030', 3: '#3070d0', 4: '#9050c0', 5: '#30a050', 6: '#c0a020', 7: '#30a0a0'}
 
 class ConstNoteTextbox:
     X = 50
@@ -0,0 +1,81 @@
+'''
+    Geometry and pitches of the fretboard, computed from the UI constants without Qt.
+
+    Rects are (x, y, width, height) tuples in the coordinates of the central widget,
+    listed string by string from string one.
+'''
+from pitch import OPEN_STRING_PITCH
+from const import *
+
+## Pitch of each open string, from string one
+STANDARD_TUNING = OPEN_STRING_PITCH
+
+def horizonLineRects():
+    '''
+        The rect of every horizon line, NOTE_PER_STRING lines per string.
+    '''
+    _class = ConstHorizonLine
+    rects = []
+    for stringIdx in range(STRING_NUM):
+        X = _class.startX - _class.stepX_1
+        Y = _class.startY + _class.stepY * stringIdx
+        for noteIdx in range(NOTE_PER_STRING):
+            if noteIdx < 5:
+                X += _class.stepX_1
+                width = _class.width_1
+            elif noteIdx < 9:
+                X += _class.stepX_2
+                width = _class.width_2
+            else:
+                X += _class.stepX_3
+                width = _class.width_3
+            rects.append((X, Y, width, _class.height))
+    return rects
+
+def verticalLineRects():
+    '''
+        The rect of every vertical line, NOTE_PER_STRING + 1 lines between each two strings.
+    '''
+    _class = ConstVerticalLine
+    rects = []
+    for stringIdx in range(STRING_NUM - 1):
+        X = _class.startX - _class.stepX_1
+        Y = _class.startY + _class.stepY * stringIdx
+        for noteIdx in range(NOTE_PER_STRING + 1):
+            if noteIdx < 5:
+                X += _class.stepX_1
+            elif noteIdx < 9:
+                X += _class.stepX_2
+            else:
+                X += _class.stepX_3
+            rects.append((X, Y, _class.width, _class.height))
+    return rects
+
+def pressPointRects():
+    '''
+        The rect of every press point, NOTE_PER_STRING points per string.
+    '''
+    _class = ConstPressPoint
+    rects = []
+    for stringIdx in range(STRING_NUM):
+        X = _class.startX - _class.stepX_1
+        Y = _class.startY + _class.stepY * stringIdx
+        for noteIdx in range(NOTE_PER_STRING):
+            if noteIdx < 4:
+                X += _class.stepX_1
+            elif noteIdx == 4:
+                X += _class.stepX_2
+            elif noteIdx < 8:
+                X += _class.stepX_3
+            elif noteIdx == 8:
+                X += _class.stepX_4
+            else:
+                X += _class.stepX_5
+            rects.append((X, Y, _class.width, _class.height))
+    return rects
+
+def pressPointPitches(tuning: tuple = STANDARD_TUNING):
+    '''
+        The pitch of every press point, a half step higher than the previous fret.
+    '''
+    return [tuning[stringIdx] + fret for stringIdx in range(STRING_NUM) for fret in range(1, NOTE_PER_STRING + 1)]
@@ -0,0 +1,125 @@
+'''
+    Playing state of the fretboard: the pressed fret and the mute of each string.
+'''
+from array import array
+from collections import deque, namedtuple
+from pitch import OPEN_STRING_PITCH
+from const import *
+
+MUTED = -1
+HISTORY_SIZE = 100
+
+## Immutable, hashable copy of a state, usable as cache key
+Snapshot = namedtuple('Snapshot', ['frets', 'muted'])
+
+class FretboardState:
+    '''
+        Fret per string (0 for open string) and a bitmask of muted strings,
+        with a bounded undo/redo history of snapshots.
+
+        Strings are numbered from 1 like OPEN_STRING_NOTE.
+    '''
+    __slots__ = ('frets', 'muted', 'undo_stack', 'redo_stack')
+
+    def __init__(self, history_size = HISTORY_SIZE):
+        self.frets = array('B', bytes(STRING_NUM))
+        self.muted = 0
+        self.undo_stack = deque(maxlen=history_size)
+        self.redo_stack = deque(maxlen=history_size)
+
+    def fret(self, stringNum):
+        return self.frets[stringNum - 1]
+
+    def isMuted(self, stringNum):
+        return bool(self.muted >> (stringNum - 1) & 1)
+
+    def press(self, stringNum, fret):
+        '''
+            Press string "stringNum" on fret, 0 to release it.
+        '''
+        self.frets[stringNum - 1] = fret
+
+    def toggleMute(self, stringNum):
+        self.muted ^= 1 << (stringNum - 1)
+
+    def setVoicing(self, voicing):
+        '''
+            Set the fret per string from string one, MUTED for muted string.
+        '''
+        self.muted = 0
+        for idx, fret in enumerate(voicing):
+            if fret == MUTED:
+                self.muted |= 1 << idx
+                fret = 0
+            self.frets[idx] = fret
+
+    def reset(self):
+        '''
+            Release and unmute every string.
+        '''
+        self.frets = array('B', bytes(STRING_NUM))
+        self.muted = 0
+
+    def voicing(self):
+        '''
+            Fret per string from string one, MUTED for muted string.
+        '''
+        return tuple(MUTED if self.muted >> idx & 1 else fret for idx, fret in enumerate(self.frets))
+
+    ######################## Snapshot ########################
+
+    def snapshot(self):
+        return Snapshot(self.frets.tobytes(), self.muted)
+
+    def restore(self, snapshot: Snapshot):
+        self.frets = array('B', snapshot.frets)
+        self.muted = snapshot.muted
+
+    ######################## History ########################
+
+    def commit(self, before: Snapshot):
+        '''
+            Record the change since snapshot "before" as one undo step.
+        '''
+        if before != self.snapshot():
+            self.undo_stack.append(before)
+            self.redo_stack.clear()
+
+    def undo(self):
+        '''
+            Go back to the state before the last step, return False if there is none.
+        '''
+        if not self.undo_stack:
+            return False
+        self.redo_stack.append(self.snapshot())
+        self.restore(self.undo_stack.pop())
+        return True
+
+    def redo(self):
+        '''
+            Redo the last undone step, return False if there is none.
+        '''
+        if not self.redo_stack:
+            return False
+        self.undo_stack.append(self.snapshot())
+        self.restore(self.redo_stack.pop())
+        return True
+
+
+def fretboardVoicing(pitches, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        Place held MIDI pitches on the strings of tuning (open string pitch from string one),
+        the lowest pitch on the lowest string that can play it. A pitch no string left can play is skipped.
+        Return the fret per string from string one, MUTED for strings without a note.
+    '''
+    voicing = [MUTED] * STRING_NUM
+    stringIdx = STRING_NUM - 1
+    for pitch in sorted(pitches):
+        placed = stringIdx
+        while placed >= 0 and not 0 <= pitch - tuning[placed] <= NOTE_PER_STRING:
+            placed -= 1
+        if placed < 0:      # Out of the range of the strings left
+            continue
+        voicing[placed] = pitch - tuning[placed]
+        stringIdx = placed - 1
+    return voicing
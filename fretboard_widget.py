@@ -0,0 +1,132 @@
+'''
+    The fretboard drawn by a single widget, instead of a QFrame per line and a QLabel per point.
+    Geometry, pitches and scaled dots are in the board model shared by every board of a tuning.
+'''
+from bisect import bisect_right
+from PyQt5 import QtCore, QtGui, QtWidgets
+from board_model import BoardModel
+from const import *
+
+class HorizonLine:
+    '''
+        A clickable horizon line of the painted fretboard, its rect is in the board model.
+    '''
+    __slots__ = ('board', 'idx', 'point')
+
+    def __init__(self, board, idx):
+        self.board = board
+        self.idx = idx
+        self.point = None
+
+    @property
+    def rect(self):
+        return self.board.model.horizon_rects[self.idx]
+
+class PressPoint:
+    '''
+        A press point of the painted fretboard, shown or hidden like the QLabel it replaces.
+        The rect and the pitch are in the board model, a point only holds its state.
+    '''
+    __slots__ = ('board', 'idx', 'stringNum', 'fret', 'press', 'hidden', 'pixmap')
+
+    def __init__(self, board, idx):
+        self.board = board
+        self.idx = idx
+        self.stringNum = None
+        self.fret = None
+        self.press = False
+        self.hidden = True
+        self.pixmap = None      # The dot of the board
+
+    @property
+    def rect(self):
+        return self.board.model.point_rects[self.idx]
+
+    @property
+    def pitch(self):
+        return self.board.model.point_pitches[self.idx]
+
+    def setPixmap(self, pixmap: QtGui.QPixmap):
+        self.pixmap = pixmap
+        if not self.hidden:
+            self.board.update(self.board.model.local_point_rects[self.idx])
+
+    def setVisible(self, visible):
+        if self.hidden == visible:
+            self.hidden = not visible
+            self.board.update(self.board.model.local_point_rects[self.idx])        # Repaint only this point
+
+    def show(self):
+        self.setVisible(True)
+
+    def hide(self):
+        self.setVisible(False)
+
+    def isHidden(self):
+        return self.hidden
+
+class FretboardWidget(QtWidgets.QWidget):
+    '''
+        Paint the lines and the shown points in one paintEvent, and map clicks to point numbers
+        through the geometry of the shared board model.
+    '''
+    def __init__(self, parent, model: BoardModel, dotPixmap: QtGui.QPixmap):
+        super().__init__(parent)
+        self.model = model
+        ## Cover the whole board, and draw in the coordinates of the parent
+        self.setGeometry(model.bounds)
+        self.origin = model.bounds.topLeft()
+        self.horizon_lines = [HorizonLine(self, idx) for idx in range(len(model.horizon_rects))]
+        self.vertical_lines = model.vertical_rects
+        self.points = [PressPoint(self, idx) for idx in range(len(model.point_rects))]
+        self.dot = model.scaledDot(dotPixmap)
+        ## Called with the point number of a clicked point or line
+        self.pressEvent = None
+
+    def pointDot(self, point: PressPoint):
+        '''
+            The scaled pixmap of a point, scaled once per pixmap by the model.
+        '''
+        if point.pixmap is None:
+            return self.dot
+        return self.model.scaledDot(point.pixmap)
+
+    def pointAt(self, pos: QtCore.QPoint):
+        '''
+            The number of the shown point or the line at pos (in the coordinates of the parent), points are on top of lines.
+        '''
+        model = self.model
+        stringIdx = (pos.y() - model.horizon_rects[0].top()) // ConstHorizonLine.stepY
+        if not 0 <= stringIdx < STRING_NUM:
+            return None
+        for rects, lefts, points in ((model.point_rects, model.point_lefts, self.points), (model.horizon_rects, model.line_lefts, None)):
+            ## Lines overlap their neighbour by one pixel, the later one is on top
+            idx = bisect_right(lefts[stringIdx], pos.x()) - 1
+            if idx < 0:
+                continue
+            idx += stringIdx * NOTE_PER_STRING
+            if rects[idx].contains(pos) and (points is None or not points[idx].hidden):
+                return idx
+        return None
+
+    def mousePressEvent(self, e):
+        idx = self.pointAt(e.pos() + self.origin)
+        if idx is not None and self.pressEvent is not None:
+            self.pressEvent(idx)
+
+    def paintEvent(self, e):
+        painter = QtGui.QPainter(self)
+        painter.translate(-self.origin)
+        region = e.rect().translated(self.origin)
+        palette = self.palette()
+        for rect in self.model.horizon_rects:
+            if rect.intersects(region):
+                y = rect.top() + rect.height() // 2
+                QtWidgets.qDrawShadeLine(painter, rect.left(), y, rect.right() + 1, y, palette, True, 1, 0)
+        for rect in self.model.vertical_rects:
+            if rect.intersects(region):
+                x = rect.left() + rect.width() // 2
+                QtWidgets.qDrawShadeLine(painter, x, rect.top(), x, rect.bottom() + 1, palette, True, 1, 0)
+        for point, rect in zip(self.points, self.model.point_rects):
+            if not point.hidden and rect.intersects(region):
+                painter.drawPixmap(rect, self.pointDot(point))
@@ -0,0 +1,142 @@
+'''
+    Spans, latency histograms and event counts of the hot paths, off by default.
+
+    When disabled, a span is a shared no-op context and a traced function only checks one flag.
+'''
+import json
+import time
+import functools
+from contextlib import nullcontext
+
+NULL_SPAN = nullcontext()
+
+class Histogram:
+    '''
+        Latencies in power-of-two microsecond buckets: bucket i counts [2^(i-1), 2^i) us, bucket 0 below 1 us.
+    '''
+    __slots__ = ('buckets', 'number', 'total', 'maximum')
+
+    def __init__(self):
+        self.buckets = []
+        self.number = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float):
+        idx = int(seconds * 1e6).bit_length()
+        if idx >= len(self.buckets):
+            self.buckets.extend([0] * (idx + 1 - len(self.buckets)))
+        self.buckets[idx] += 1
+        self.number += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, rank: float):
+        '''
+            Upper bound of the bucket holding the rank-th percentile, in seconds.
+        '''
+        target = self.number * rank / 100
+        seen = 0
+        for idx, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min((1 << idx) * 1e-6, self.maximum)
+        return self.maximum
+
+    def toDict(self):
+        return {'count': self.number, 'total': self.total, 'max': self.maximum,
+                'p50': self.percentile(50), 'p99': self.percentile(99), 'buckets_us': self.buckets}
+
+class Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class Tracer:
+    '''
+        Per-span latency histograms, named event counts and gauges (last and highest value).
+    '''
+    def __init__(self):
+        self.enabled = False
+        self.histograms = dict()
+        self.counts = dict()
+        self.gauges = dict()
+
+    def span(self, name: str):
+        '''
+            A context timing its body into the histogram of name, a no-op when disabled.
+        '''
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def observe(self, name: str, seconds: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def count(self, name: str, number: int = 1):
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + number
+
+    def gauge(self, name: str, value):
+        if self.enabled:
+            _, highest = self.gauges.get(name, (value, value))
+            self.gauges[name] = (value, max(highest, value))
+
+    def reset(self):
+        self.histograms.clear()
+        self.counts.clear()
+        self.gauges.clear()
+
+    def summary(self):
+        '''
+            Lines of a text report, spans by total time.
+        '''
+        lines = [f'{"span":<28}{"count":>8}{"mean us":>10}{"p50 us":>10}{"p99 us":>10}{"max us":>10}']
+        for name, histogram in sorted(self.histograms.items(), key=lambda item: -item[1].total):
+            lines.append(f'{name:<28}{histogram.number:8d}{histogram.total / histogram.number * 1e6:10.1f}'
+                         f'{histogram.percentile(50) * 1e6:10.1f}{histogram.percentile(99) * 1e6:10.1f}{histogram.maximum * 1e6:10.1f}')
+        for name, number in sorted(self.counts.items()):
+            lines.append(f'{name:<28}{number:8d}')
+        for name, (value, highest) in sorted(self.gauges.items()):
+            lines.append(f'{name:<28}{value:8} (max {highest})')
+        return lines
+
+    def export(self, path):
+        '''
+            Write the histograms, counts and gauges to a JSON file.
+        '''
+        with open(path, 'w') as f:
+            json.dump({'spans': {name: histogram.toDict() for name, histogram in self.histograms.items()},
+                       'counts': self.counts,
+                       'gauges': {name: {'last': value, 'max': highest} for name, (value, highest) in self.gauges.items()}},
+                      f, indent=2)
+
+## The tracer shared by the whole application
+tracer = Tracer()
+
+def traced(name: str):
+    '''
+        Decorate a function to run inside a span of the shared tracer.
+    '''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(tracer, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
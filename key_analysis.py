@@ -0,0 +1,279 @@
+'''
+    Song-level key detection and roman numerals of a chord sequence, without Qt.
+
+    Each chord is a 12-bin pitch-class vector (the root weighted ROOT_WEIGHT), the vectors of a window
+    of KEY_WINDOW chords centered on a chord are summed, and the key is the Krumhansl-Kessler profile
+    of the 24 major and minor keys best correlated with the sum, for all windows in one matrix product.
+    Appending chords only re-keys the chords whose window reaches the new ones.
+
+    Chord names are the ones checkChord shows, e.g. "Am7", "C/E", "Cadd2", with flat roots accepted.
+
+    Usage: python key_analysis.py [--window 16] [--changes] chords.jsonl song.txt ...
+           python tab_analyzer.py song.txt | python key_analysis.py -
+'''
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from chord_table import componentQualities, SIMPLE_ADDS, PITCH_CLASS_NUM
+from chord_formula import FLAT_NOTES
+from const import *
+
+KEY_WINDOW = 16     # Chords around a chord deciding its key
+ROOT_WEIGHT = 2.0
+NO_KEY = -1
+## Key k is major on pitch class k for k < 12, minor on pitch class k - 12 otherwise
+KEY_NUM = 2 * PITCH_CLASS_NUM
+
+## Krumhansl-Kessler probe tone profiles, from the tonic
+MAJOR_PROFILE = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+MINOR_PROFILE = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)
+
+## Numeral of each semitone above the tonic, upper case, chromatic degrees named from the nearest scale degree
+MAJOR_NUMERALS = ('I', 'bII', 'II', 'bIII', 'III', 'IV', '#IV', 'V', 'bVI', 'VI', 'bVII', 'VII')
+MINOR_NUMERALS = ('I', 'bII', 'II', 'III', '#III', 'IV', '#IV', 'V', 'VI', '#VI', 'VII', '#VII')
+
+def zScore(x, axis = -1):
+    '''
+        x standardized along axis, zero where it has no variance.
+    '''
+    x = x - x.mean(axis=axis, keepdims=True)
+    std = x.std(axis=axis, keepdims=True)
+    return np.divide(x, std, out=np.zeros_like(x), where=std > 0)
+
+## Standardized profile of every key, (KEY_NUM, 12)
+KEY_PROFILES = zScore(np.array([np.roll(MAJOR_PROFILE, tonic) for tonic in range(PITCH_CLASS_NUM)] +
+                               [np.roll(MINOR_PROFILE, tonic) for tonic in range(PITCH_CLASS_NUM)]))
+
+def keyName(key: int):
+    '''
+        The name of a key like "A minor", as parseScale() reads it, '' for NO_KEY.
+    '''
+    if key == NO_KEY:
+        return ''
+    return f'{NOTES[key % PITCH_CLASS_NUM]} {"minor" if key >= PITCH_CLASS_NUM else "major"}'
+
+_quality_masks = None
+
+def qualityMasks():
+    '''
+        The 12-bit mask of intervals above the root of every quality name, with the add2 / add4 names
+        of the chord table.
+    '''
+    global _quality_masks
+    if _quality_masks is None:
+        _quality_masks = dict()
+        for components, name in componentQualities().items():
+            mask = 0
+            for interval in components:
+                mask |= 1 << interval % PITCH_CLASS_NUM
+            _quality_masks.setdefault(name, mask)
+        for name, mask in list(_quality_masks.items()):
+            for added, simple in SIMPLE_ADDS:
+                if name.endswith(added):
+                    _quality_masks.setdefault(name[:-len(added)] + simple, mask)
+    return _quality_masks
+
+def parseChord(chordName: str):
+    '''
+        The (root pitch class, interval mask above the root) of a chord name, None if it is not a chord.
+        The bass of a slash chord is left out, it doesn't change the function of the chord.
+    '''
+    chordName = chordName.strip().partition('/')[0]
+    rootLength = 2 if chordName[1:2] in ('#', 'b') else 1
+    root, quality = chordName[:rootLength], chordName[rootLength:]
+    root = FLAT_NOTES.get(root, root)
+    mask = qualityMasks().get(quality)
+    if root not in NOTES or mask is None:
+        return None
+    return NOTES.index(root), mask
+
+def romanNumeral(root: int, mask: int, key: int):
+    '''
+        The roman numeral of a chord in a key: lower case for a minor third, "°" diminished, "ø" half-diminished,
+        "+" augmented, with "7" or "maj7" for a seventh.
+    '''
+    tonic = key % PITCH_CLASS_NUM
+    numeral = (MINOR_NUMERALS if key >= PITCH_CLASS_NUM else MAJOR_NUMERALS)[(root - tonic) % PITCH_CLASS_NUM]
+    has = lambda interval: bool(mask >> interval & 1)
+    minor = has(3) and not has(4)
+    if minor:
+        numeral = numeral.lower()
+    if minor and has(6) and not has(7):
+        if has(10):
+            return numeral + 'ø7'
+        return numeral + ('°7' if has(9) else '°')
+    if has(4) and has(8) and not has(7):
+        numeral += '+'
+    if has(10):
+        return numeral + '7'
+    if has(11):
+        return numeral + 'maj7'
+    return numeral
+
+class KeyTimeline:
+    '''
+        The key and roman numeral of every chord of a growing chord sequence.
+
+        Row i of prefix is the sum of the chord vectors before chord i, so the vector of any window is
+        one subtraction. Arrays grow by doubling, and chords unknown to qualityMasks() have no numeral.
+    '''
+    def __init__(self, window: int = KEY_WINDOW):
+        self.half = window // 2
+        self.length = 0
+        self.prefix = np.zeros((1, PITCH_CLASS_NUM))
+        self.chord_ids = np.zeros(0, dtype=np.int32)
+        self.keys = np.zeros(0, dtype=np.int8)
+        self.numerals = []
+        ## Distinct chord names, with the (root, mask) and the vector of each
+        self.chord_names = []
+        self.chord_numbers = dict()
+        self.chords = []
+        self.vectors = np.zeros((0, PITCH_CLASS_NUM))
+        ## Numeral of every (chord id, key) code of analyze()
+        self.numeral_cache = dict()
+
+    def __len__(self):
+        return self.length
+
+    def chordIds(self, chordNames):
+        '''
+            The id of every chord name, numbering the new ones.
+        '''
+        ids = np.empty(len(chordNames), dtype=np.int32)
+        first_new = len(self.chord_names)
+        for idx, chordName in enumerate(chordNames):
+            number = self.chord_numbers.get(chordName)
+            if number is None:
+                number = self.chord_numbers[chordName] = len(self.chord_names)
+                self.chord_names.append(chordName)
+                self.chords.append(parseChord(chordName))
+            ids[idx] = number
+        if first_new < len(self.chord_names):
+            vectors = np.zeros((len(self.chord_names) - first_new, PITCH_CLASS_NUM))
+            for row, chord in zip(vectors, self.chords[first_new:]):
+                if chord is not None:
+                    root, mask = chord
+                    for interval in range(PITCH_CLASS_NUM):
+                        if mask >> interval & 1:
+                            row[(root + interval) % PITCH_CLASS_NUM] = 1
+                    row[root] = ROOT_WEIGHT
+            self.vectors = np.concatenate([self.vectors, vectors])
+        return ids
+
+    def reserve(self, length: int):
+        '''
+            Grow the arrays to hold "length" chords, doubling their capacity.
+        '''
+        capacity = len(self.chord_ids)
+        if length <= capacity:
+            return
+        capacity = max(length, 2 * capacity)
+        self.prefix = np.concatenate([self.prefix, np.zeros((capacity + 1 - len(self.prefix), PITCH_CLASS_NUM))])
+        self.chord_ids = np.concatenate([self.chord_ids, np.zeros(capacity - len(self.chord_ids), dtype=np.int32)])
+        self.keys = np.concatenate([self.keys, np.full(capacity - len(self.keys), NO_KEY, dtype=np.int8)])
+
+    def extend(self, chordNames):
+        '''
+            Append chords, and key the new chords and the earlier ones whose window reaches them.
+            Return the index of the first chord whose key or numeral may have changed.
+        '''
+        start, end = self.length, self.length + len(chordNames)
+        if start == end:
+            return start
+        self.reserve(end)
+        ids = self.chordIds(chordNames)
+        self.chord_ids[start:end] = ids
+        self.prefix[start + 1:end + 1] = self.prefix[start] + np.cumsum(self.vectors[ids], axis=0)
+        self.numerals.extend([''] * len(chordNames))
+        self.length = end
+        first = max(0, start - self.half)
+        self.analyze(first, end)
+        return first
+
+    def append(self, chordName: str):
+        return self.extend([chordName])
+
+    def analyze(self, start: int, end: int):
+        '''
+            Key the chords from start to end by the windows around them, and name their numerals.
+        '''
+        idx = np.arange(start, end)
+        lows = np.maximum(idx - self.half, 0)
+        highs = np.minimum(idx + self.half + 1, self.length)
+        windows = self.prefix[highs] - self.prefix[lows]
+        correlations = zScore(windows) @ KEY_PROFILES.T
+        keys = correlations.argmax(axis=1).astype(np.int8)
+        keys[windows.max(axis=1) == 0] = NO_KEY        # Nothing but unknown chords around
+        self.keys[start:end] = keys
+
+        ## A numeral per distinct (chord, key) pair, keys shifted so NO_KEY is 0
+        codes = self.chord_ids[start:end].astype(np.int64) * (KEY_NUM + 1) + keys + 1
+        unique, inverse = np.unique(codes, return_inverse=True)
+        names = []
+        for code in unique.tolist():
+            numeral = self.numeral_cache.get(code)
+            if numeral is None:
+                chord_id, key = divmod(code, KEY_NUM + 1)
+                chord = self.chords[chord_id]
+                numeral = self.numeral_cache[code] = romanNumeral(*chord, key - 1) if chord is not None and key else ''
+            names.append(numeral)
+        self.numerals[start:end] = [names[idx] for idx in inverse.reshape(-1).tolist()]
+
+    def chordName(self, idx: int):
+        return self.chord_names[self.chord_ids[idx]]
+
+    def key(self, idx: int):
+        return int(self.keys[idx])
+
+    def keyChanges(self):
+        '''
+            The (index, key) of the first chord of every key region.
+        '''
+        keys = self.keys[:self.length]
+        starts = np.flatnonzero(np.diff(keys, prepend=NO_KEY - 1))
+        return [(int(idx), int(keys[idx])) for idx in starts]
+
+def readChordNames(f):
+    '''
+        The chord names of a file: JSON lines with a "chord" field like tab_analyzer's output,
+        or chord names separated by white space.
+    '''
+    chordNames = []
+    for line in f:
+        line = line.strip()
+        if line.startswith('{'):
+            chord = json.loads(line).get('chord')
+            if chord:
+                chordNames.append(chord)
+        else:
+            chordNames.extend(line.split())
+    return chordNames
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Detect the keys of chord sequences and name their roman numerals.')
+    parser.add_argument('paths', nargs='*', default=['-'], help='chord name or JSON lines files, "-" for stdin')
+    parser.add_argument('--window', type=int, default=KEY_WINDOW, help='chords around a chord deciding its key')
+    parser.add_argument('--changes', action='store_true', help='only print where the key changes')
+    args = parser.parse_args()
+
+    for path in args.paths:
+        if path == '-':
+            chordNames = readChordNames(sys.stdin)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                chordNames = readChordNames(f)
+        start = time.perf_counter()
+        timeline = KeyTimeline(args.window)
+        timeline.extend(chordNames)
+        elapsed = time.perf_counter() - start
+        if len(args.paths) > 1:
+            print(f'# {path}')
+        if args.changes:
+            for idx, key in timeline.keyChanges():
+                print(f'{idx}\t{keyName(key)}')
+        else:
+            for idx in range(len(timeline)):
+                print(f'{idx}\t{timeline.chordName(idx)}\t{keyName(timeline.key(idx))}\t{timeline.numerals[idx]}')
+        print(f'{len(timeline)} chords in {elapsed:.3f} s', file=sys.stderr)
@@ -0,0 +1,104 @@
+'''
+    Follow the notes held on a MIDI input, and show them on the fretboard with their chord.
+
+    MIDI messages are read on a background thread, and a burst of messages is coalesced
+    into one fretboard update on the GUI thread.
+
+    Usage: python ThreeNotes.py --midi virtual      (a virtual input port named ThreeNotes)
+           python ThreeNotes.py --midi PORT_NAME
+           python ThreeNotes.py --midi song.mid     (replay a MIDI file)
+'''
+import time
+import threading
+import mido
+from PyQt5 import QtCore
+from fretboard_state import fretboardVoicing
+
+VIRTUAL_PORT_NAME = 'ThreeNotes'
+
+def portMessages(name):
+    '''
+        The messages of a MIDI input port, "virtual" to open a virtual port for other programs.
+    '''
+    if name == 'virtual':
+        port = mido.open_input(VIRTUAL_PORT_NAME, virtual=True)
+    else:
+        port = mido.open_input(name)
+    with port:
+        yield from port
+
+def fileMessages(path, speed = 1.0):
+    '''
+        The messages of a MIDI file at "speed" times of the original tempo, 0 for no waiting.
+    '''
+    for message in mido.MidiFile(path):
+        if speed and message.time:
+            time.sleep(message.time / speed)
+        if not message.is_meta:
+            yield message
+
+def percentiles(values, ranks = (50, 90, 99)):
+    values = sorted(values)
+    if not values:
+        return {rank: 0.0 for rank in ranks}
+    return {rank: values[min(len(values) - 1, len(values) * rank // 100)] for rank in ranks}
+
+class MidiFollower(QtCore.QObject):
+    '''
+        Keep the held notes of a MIDI message stream and show them on a ThreeNotes window.
+    '''
+    changed = QtCore.pyqtSignal()
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, ui, messages):
+        super().__init__()
+        self.ui = ui
+        self.messages = messages
+        self.lock = threading.Lock()
+        self.held = set()
+        self.pending_since = None       # Arrival of the first message not displayed yet
+        self.message_num = 0
+        self.latencies = []
+        self.changed.connect(self.display)      # Queued to the GUI thread
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        for message in self.messages:
+            if message.type not in ('note_on', 'note_off'):
+                continue
+            with self.lock:
+                if message.type == 'note_on' and message.velocity > 0:
+                    self.held.add(message.note)
+                else:
+                    self.held.discard(message.note)
+                self.message_num += 1
+                notify = self.pending_since is None
+                if notify:
+                    self.pending_since = time.perf_counter()
+            if notify:      # Later messages of the burst are picked up by the same update
+                self.changed.emit()
+        self.finished.emit()
+
+    def display(self):
+        '''
+            Show the notes held now, and record the latency from the oldest message not displayed.
+        '''
+        with self.lock:
+            held = list(self.held)
+            since = self.pending_since
+            self.pending_since = None
+        if since is None:
+            return
+        self.ui.applyVoicing(fretboardVoicing(held, self.ui.model.tuning))
+        self.latencies.append(time.perf_counter() - since)
+
+    def report(self):
+        '''
+            Print the note-to-display latency percentiles.
+        '''
+        ranks = percentiles(self.latencies)
+        print(f'{self.message_num} messages, {len(self.latencies)} updates, latency ' +
+              ', '.join(f'p{rank} {latency * 1e3:.2f} ms' for rank, latency in ranks.items()))
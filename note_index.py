@@ -0,0 +1,62 @@
+'''
+    Index from pitches to the press points of the fretboard, as bitmasks of point numbers.
+
+    Point number i is the i-th point of fretboard_geometry.pressPointPitches(), string by string from string one.
+'''
+import re
+from fretboard_geometry import pressPointPitches
+from pitch import OCTAVE, midiPitch
+from const import *
+
+## A note query token: note name, optional octave, optional semitones above it, e.g. "C#", "C#4", "A+7", "A2+7"
+QUERY_TOKEN = re.compile(r'([A-G]#?)(-?\d+)?(?:\+(\d+))?')
+
+class NoteIndex:
+    '''
+        Bitmask of the points of every pitch and every pitch class.
+    '''
+    def __init__(self, pitches: list = None):
+        self.pitch_masks = dict()
+        self.class_masks = [0] * OCTAVE
+        for idx, pitch in enumerate(pitches or pressPointPitches()):
+            self.pitch_masks[pitch] = self.pitch_masks.get(pitch, 0) | 1 << idx
+            self.class_masks[pitch % OCTAVE] |= 1 << idx
+
+    def classMask(self, pitchClass: int):
+        '''
+            The points of a pitch class, a note in every octave.
+        '''
+        return self.class_masks[pitchClass % OCTAVE]
+
+    def pitchMask(self, pitch: int):
+        '''
+            The points of an exact pitch.
+        '''
+        return self.pitch_masks.get(pitch, 0)
+
+    def query(self, text: str):
+        '''
+            The points of a set of notes separated by spaces or commas, e.g. "C E G", "C#4", "A+7".
+        '''
+        mask = 0
+        for token in re.split(r'[\s,]+', text.strip()):
+            if not token:
+                continue
+            match = QUERY_TOKEN.fullmatch(token)
+            if not match:
+                raise ValueError(f'Unknown note "{token}"')
+            noteName, octave, semitones = match.groups()
+            if octave is None:
+                mask |= self.classMask(NOTES.index(noteName) + int(semitones or 0))
+            else:
+                mask |= self.pitchMask(midiPitch(noteName, int(octave)) + int(semitones or 0))
+        return mask
+
+def maskBits(mask: int):
+    '''
+        The point numbers set in mask.
+    '''
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,57 @@
+'''
+    Pitches as MIDI note numbers, spelled into a note name and an octave only for display.
+
+    Middle C (C4) is 60. A pitch class is the pitch modulo OCTAVE, the index of its name in NOTES.
+'''
+import re
+from const import *
+
+OCTAVE = len(NOTES)
+## A spelled pitch, note name and octave, e.g. "C#4", "E2"
+PITCH_TOKEN = re.compile(r'([A-G]#?)(-?\d+)')
+
+def midiPitch(noteName: str, octave: int):
+    return NOTES.index(noteName) + OCTAVE * (octave + 1)
+
+def spellPitch(pitch: int):
+    '''
+        The (noteName, octave) of a pitch.
+    '''
+    return NOTES[pitch % OCTAVE], pitch // OCTAVE - 1
+
+def parsePitch(text: str):
+    '''
+        The pitch of a spelled pitch like "C#4", raise ValueError for anything else.
+    '''
+    match = PITCH_TOKEN.fullmatch(text.strip())
+    if not match:
+        raise ValueError(f'Unknown pitch "{text}"')
+    return midiPitch(match.group(1), int(match.group(2)))
+
+def pitchClassMask(pitches):
+    '''
+        The 12-bit pitch-class mask of pitches.
+    '''
+    mask = 0
+    for pitch in pitches:
+        mask |= 1 << pitch % OCTAVE
+    return mask
+
+def compoundMask(pitches):
+    '''
+        The 12-bit pitch-class mask of the pitches sounding only over an octave above the lowest pitch.
+    '''
+    if not pitches:
+        return 0
+    bass = min(pitches)
+    return pitchClassMask(pitches) & ~pitchClassMask([pitch for pitch in pitches if pitch - bass < OCTAVE])
+
+## Open string pitches, from string one
+OPEN_STRING_PITCH = tuple(midiPitch(OPEN_STRING_NOTE[stringNum]['noteName'], OPEN_STRING_NOTE[stringNum]['pitchNum'])
+                          for stringNum in range(1, STRING_NUM + 1))
+
+def voicingPitches(voicing, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        The sounding pitches of a voicing (fret per string from string one, negative for muted string).
+    '''
+    return [open_pitch + fret for open_pitch, fret in zip(tuning, voicing) if fret >= 0]
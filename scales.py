@@ -0,0 +1,53 @@
+'''
+    Scales and keys by the semitones above the root, with the degree of every note.
+'''
+from chord_formula import FLAT_NOTES
+from const import *
+
+## Semitones above the root of each scale, cycled in this order
+SCALES = {
+    'major': (0, 2, 4, 5, 7, 9, 11),
+    'minor': (0, 2, 3, 5, 7, 8, 10),
+    'harmonic minor': (0, 2, 3, 5, 7, 8, 11),
+    'melodic minor': (0, 2, 3, 5, 7, 9, 11),
+    'dorian': (0, 2, 3, 5, 7, 9, 10),
+    'phrygian': (0, 1, 3, 5, 7, 8, 10),
+    'lydian': (0, 2, 4, 6, 7, 9, 11),
+    'mixolydian': (0, 2, 4, 5, 7, 9, 10),
+    'locrian': (0, 1, 3, 5, 6, 8, 10),
+    'major pentatonic': (0, 2, 4, 7, 9),
+    'minor pentatonic': (0, 3, 5, 7, 10),
+    'blues': (0, 3, 5, 6, 7, 10),
+}
+SCALE_ALIASES = {'ionian': 'major', 'aeolian': 'minor', 'natural minor': 'minor', 'm': 'minor'}
+SCALE_NAMES = list(SCALES)
+
+DEGREE_NAMES = ['1', 'b2', '2', 'b3', '3', '4', 'b5', '5', 'b6', '6', 'b7', '7']
+
+def degreeName(interval: int, scaleName: str):
+    '''
+        The degree of a note "interval" semitones above the root, "#4" instead of "b5" if the scale has a fifth.
+    '''
+    if interval == 6 and 7 in SCALES[scaleName]:
+        return '#4'
+    return DEGREE_NAMES[interval]
+
+def degreeNumber(interval: int, scaleName: str):
+    '''
+        The degree number 1 to 7 of a note "interval" semitones above the root, its color in Scale Mode.
+    '''
+    return int(degreeName(interval, scaleName).lstrip('b#'))
+
+def parseScale(text: str):
+    '''
+        Parse a key like "A minor pentatonic", "D dorian" or "C" (major) into (root pitch class, scale name).
+    '''
+    root, _, scaleName = text.strip().partition(' ')
+    root = FLAT_NOTES.get(root, root)
+    if root not in NOTES:
+        raise ValueError(f'Unknown root "{root}"')
+    scaleName = ' '.join(scaleName.lower().split()) or 'major'
+    scaleName = SCALE_ALIASES.get(scaleName, scaleName)
+    if scaleName not in SCALES:
+        raise ValueError(f'Unknown scale "{scaleName}"')
+    return NOTES.index(root), scaleName
@@ -0,0 +1,141 @@
+'''
+    Record the user events of a ThreeNotes window in a compact binary log, and replay them.
+
+    A log is a header with the flags and the tuning of the window, and one fixed-size record per event:
+    milliseconds since the start, event kind, argument, and the CRC32 of the chord text and note labels
+    after the event.
+    Replaying checks every event shows the same text as recorded.
+
+    Usage: python ThreeNotes.py --record session.tnsl
+           python session_log.py session.tnsl [--speed 1]      (0 for maximum speed)
+'''
+import sys
+import time
+import zlib
+import struct
+import argparse
+from pitch import OPEN_STRING_PITCH
+from const import *
+
+MAGIC = b'TNSL'
+VERSION = 3
+HEADER = struct.Struct(f'<4sHB{STRING_NUM}s')     # Magic, version, flags, open string pitches from string one
+RECORD = struct.Struct('<IBHI')     # Milliseconds, kind, argument, display checksum
+
+FLAG_RANKED = 1
+
+## Event kinds, the argument is the point number for POINT, the string number for MUTE
+## and the index in Mode of the mode changed to for MODE
+POINT, MUTE, RESET, MODE, UNDO, REDO = range(1, 7)
+EVENT_NAMES = {POINT: 'point', MUTE: 'mute', RESET: 'reset', MODE: 'mode', UNDO: 'undo', REDO: 'redo'}
+
+def displayChecksum(ui):
+    '''
+        CRC32 of the chord text and the note label of every string.
+    '''
+    texts = [ui.textBrowser_chord_identifier.toPlainText()] + [textBrowser.toPlainText() for textBrowser in ui.textBrowsers]
+    return zlib.crc32('\x1f'.join(texts).encode())
+
+class SessionRecorder:
+    '''
+        Append the events of a window to a log file.
+    '''
+    def __init__(self, path, ranked = False, tuning: tuple = OPEN_STRING_PITCH):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, FLAG_RANKED if ranked else 0, bytes(tuning)))
+        self.start = time.perf_counter()
+        self.event_num = 0
+
+    def record(self, ui, kind: int, argument: int = 0):
+        milliseconds = int((time.perf_counter() - self.start) * 1000)
+        self.file.write(RECORD.pack(milliseconds, kind, argument, displayChecksum(ui)))
+        self.event_num += 1
+
+    def close(self):
+        self.file.close()
+
+def readSession(path):
+    '''
+        The flags and the tuning of a log, and a generator of its (milliseconds, kind, argument, checksum) records.
+        Raise ValueError for a file that is not a log, or from the generator at a truncated record.
+    '''
+    f = open(path, 'rb')
+    header = f.read(HEADER.size)
+    magic, version, flags, tuning = HEADER.unpack(header) if len(header) == HEADER.size else (b'', 0, 0, b'')
+    if magic != MAGIC or version != VERSION:
+        f.close()
+        raise ValueError(f'{path} is not a version {VERSION} session log')
+    def records():
+        with f:
+            record_num = 0
+            while True:
+                data = f.read(RECORD.size * 1024)
+                whole = len(data) - len(data) % RECORD.size
+                yield from RECORD.iter_unpack(data[:whole])
+                record_num += whole // RECORD.size
+                if whole < len(data):
+                    raise ValueError(f'{path} is truncated after {record_num} records')
+                if len(data) < RECORD.size * 1024:
+                    return
+    return flags, tuple(tuning), records()
+
+def replayEvent(ui, kind: int, argument: int):
+    '''
+        Apply an event through the widgets and handlers the user goes through.
+    '''
+    if kind == POINT:
+        ui.pointPressEvent(ui.points[argument])(None)
+    elif kind == MUTE:
+        ui.checkBoxs[argument - 1].click()
+    elif kind == RESET:
+        ui.resetButton.click()
+    elif kind == MODE:
+        ui.setMode(list(Mode)[argument])
+    elif kind == UNDO:
+        ui.undoEvent()
+    elif kind == REDO:
+        ui.redoEvent()
+    else:
+        raise ValueError(f'Unknown event kind {kind}')
+
+def replaySession(ui, records, speed: float = 0):
+    '''
+        Replay the records on a window at "speed" times of the original pace, 0 for maximum speed.
+        Return the number of events, the (event number, kind) of the mismatched ones and the seconds spent.
+    '''
+    from PyQt5 import QtWidgets
+    event_num = 0
+    mismatches = []
+    start = time.perf_counter()
+    for milliseconds, kind, argument, checksum in records:
+        if speed:
+            delay = milliseconds / 1000 / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            QtWidgets.QApplication.processEvents()
+        replayEvent(ui, kind, argument)
+        if displayChecksum(ui) != checksum:
+            mismatches.append((event_num, EVENT_NAMES[kind]))
+        event_num += 1
+    return event_num, mismatches, time.perf_counter() - start
+
+if __name__ == '__main__':
+    import os
+    parser = argparse.ArgumentParser(description='Replay a session log on a headless window and check its display.')
+    parser.add_argument('path')
+    parser.add_argument('--speed', type=float, default=0, help='times of the original pace, 0 for maximum speed')
+    parser.add_argument('--painted', action='store_true', help='replay on the painted fretboard')
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5 import QtWidgets
+    from ThreeNotes import ThreeNotes
+    app = QtWidgets.QApplication(sys.argv[:1])
+    flags, tuning, records = readSession(args.path)
+    MainWindow = QtWidgets.QMainWindow()
+    ui = ThreeNotes(MainWindow, painted=args.painted, ranked=bool(flags & FLAG_RANKED), tuning=tuning)
+    event_num, mismatches, elapsed = replaySession(ui, records, args.speed)
+    print(f'{event_num} events in {elapsed:.2f} s ({event_num / max(elapsed, 1e-9):,.0f} events/s), {len(mismatches)} mismatches')
+    for number, name in mismatches[:20]:
+        print(f'    event {number} ({name}) shows a different chord or note label')
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,26 @@
+'''
+    A window showing the live report of the shared tracer.
+'''
+from PyQt5 import QtCore, QtGui, QtWidgets
+from instrumentation import tracer
+
+STATS_REFRESH_MS = 500
+
+class StatsPanel(QtWidgets.QPlainTextEdit):
+    '''
+        Read-only text of tracer.summary(), refreshed while shown.
+    '''
+    def __init__(self, parent = None):
+        super().__init__(parent)
+        self.setWindowTitle('ThreeNotes Stats')
+        self.setWindowFlags(QtCore.Qt.Window)
+        self.setReadOnly(True)
+        self.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.resize(640, 320)
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(STATS_REFRESH_MS)
+
+    def refresh(self):
+        if self.isVisible():
+            self.setPlainText('\n'.join(tracer.summary()))
@@ -0,0 +1,157 @@
+'''
+    Identify the chords of ASCII guitar tabs, without Qt.
+
+    A tab system is six consecutive lines like "e|--3--|", string one on top.
+    Numbers on different strings whose columns overlap are one vertical chord.
+
+    Usage: python tab_analyzer.py [--workers N] [--output chords.jsonl] tabs/ song.txt ...
+           python tab_analyzer.py - < song.txt
+'''
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from multiprocessing import Pool
+from chord_analyzer import identify, MUTED
+from voicing_enumerator import formatVoicing
+from const import *
+
+## A tab line: optional string name, then the frets after the first bar
+TAB_LINE = re.compile(r'^\s*(?:[A-Ga-g][#b]?)?\s*\|(.*)$')
+FRET = re.compile(r'\d+')
+TAB_SUFFIXES = ('.txt', '.tab')
+MIN_CHORD_STRINGS = 2
+CHUNK_SYSTEMS = 64       # Systems of a file analyzed by a process at once
+IN_FLIGHT_CHUNKS = 4     # Chunks queued per process ahead of the output
+
+def tabSystems(lines):
+    '''
+        Yield the fret text of each tab system as STRING_NUM strings, from string one.
+    '''
+    system = []
+    for line in lines:
+        match = TAB_LINE.match(line.rstrip('\n'))
+        if match and '-' in match.group(1):
+            system.append(match.group(1))
+            continue
+        if len(system) == STRING_NUM:
+            yield system
+        system = []
+    if len(system) == STRING_NUM:
+        yield system
+
+def tabChords(system):
+    '''
+        Yield (column, voicing) of every vertical chord of a system, voicings from string one.
+    '''
+    ## (start, end, string index, fret) of every number, a chord is a run of overlapping numbers
+    numbers = sorted((match.start(), match.end(), idx, int(match.group()))
+                     for idx, text in enumerate(system) for match in FRET.finditer(text))
+    voicing, column, end = None, 0, -1
+    for start, stop, idx, fret in numbers:
+        if start >= end:
+            if voicing is not None and STRING_NUM - voicing.count(MUTED) >= MIN_CHORD_STRINGS:
+                yield column, voicing
+            voicing, column = [MUTED] * STRING_NUM, start
+        voicing[idx] = fret
+        end = max(end, stop) if start < end else stop
+    if voicing is not None and STRING_NUM - voicing.count(MUTED) >= MIN_CHORD_STRINGS:
+        yield column, voicing
+
+def analyzeSystems(systems, path: str, first_system: int = 0):
+    '''
+        Yield a record of every chord of consecutive systems of a tab, numbered from first_system.
+    '''
+    for system_num, system in enumerate(systems, first_system):
+        for column, voicing in tabChords(system):
+            yield {'file': path, 'system': system_num, 'column': column,
+                   'voicing': formatVoicing(voicing), 'chord': identify(voicing)}
+
+def analyzeLines(lines, path: str):
+    '''
+        Yield a record of every chord of a tab.
+    '''
+    yield from analyzeSystems(tabSystems(lines), path)
+
+def analyzeChunk(chunk):
+    '''
+        The path and JSON lines of the chords of a chunk (path, first system number, systems) of a tab file.
+    '''
+    path, first_system, systems = chunk
+    return path, [json.dumps(record) for record in analyzeSystems(systems, path, first_system)]
+
+def tabFiles(paths):
+    '''
+        Yield the tab files of paths, searching directories recursively.
+    '''
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for directory, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.lower().endswith(TAB_SUFFIXES):
+                    yield os.path.join(directory, name)
+
+def systemChunks(paths):
+    '''
+        Yield (path, first system number, systems) of up to CHUNK_SYSTEMS systems of every tab file,
+        reading each file as its chunks are taken.
+    '''
+    for path in tabFiles(paths):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            systems, first_system = [], 0
+            for system in tabSystems(f):
+                systems.append(system)
+                if len(systems) == CHUNK_SYSTEMS:
+                    yield path, first_system, systems
+                    systems, first_system = [], first_system + CHUNK_SYSTEMS
+            yield path, first_system, systems
+
+def analyzeFiles(paths, workers: int = None):
+    '''
+        Yield the (path, JSON lines) of each chunk of systems of the tab files in order, chunks sharded
+        across a process pool with at most IN_FLIGHT_CHUNKS per process read ahead, so memory stays bounded
+        and a large file streams out as its chunks are done.
+    '''
+    workers = workers or os.cpu_count()
+    with Pool(workers) as pool:
+        pending = deque()
+        limit = IN_FLIGHT_CHUNKS * workers
+        for chunk in systemChunks(paths):
+            pending.append(pool.apply_async(analyzeChunk, (chunk,)))
+            if len(pending) >= limit:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Identify the chords of ASCII guitar tabs as JSON lines.')
+    parser.add_argument('paths', nargs='*', default=['-'], help='tab files or directories, "-" for stdin')
+    parser.add_argument('--workers', type=int, default=None, help='processes, default to the number of cores')
+    parser.add_argument('--output', default=None, help='write the JSON lines to this file instead of stdout')
+    args = parser.parse_args()
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    start = time.perf_counter()
+    file_num = chord_num = 0
+    last_path = None
+    if args.paths == ['-']:
+        results = [('-', (json.dumps(record) for record in analyzeLines(sys.stdin, '-')))]
+    else:
+        results = analyzeFiles(args.paths, args.workers)
+    for path, lines in results:
+        if path != last_path:       # The first chunk of a file
+            file_num += 1
+            last_path = path
+        for line in lines:
+            output.write(line + '\n')
+            chord_num += 1
+    elapsed = time.perf_counter() - start
+    if output is not sys.stdout:
+        output.close()
+    print(f'{file_num} files, {chord_num} chords in {elapsed:.2f} s '
+          f'({file_num / elapsed:,.0f} files/s, {chord_num / elapsed:,.0f} chords/s)', file=sys.stderr)
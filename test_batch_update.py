@@ -0,0 +1,51 @@
+'''
+    One chord evaluation per user action, however many strings it changes.
+
+    Usage: python -m pytest test_batch_update.py      (or python -m unittest test_batch_update)
+'''
+import os
+import sys
+import unittest
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt5 import QtWidgets
+from ThreeNotes import ThreeNotes
+from fretboard_state import MUTED
+
+_qt_application = None
+
+class BatchUpdateTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        global _qt_application
+        _qt_application = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def setUp(self):
+        self.MainWindow = QtWidgets.QMainWindow()
+        self.ui = ThreeNotes(self.MainWindow)       # Chords identified on the GUI thread
+
+    def evaluations(self, action):
+        '''
+            Chord evaluations done by action.
+        '''
+        before = self.ui.chord_evaluations
+        action()
+        return self.ui.chord_evaluations - before
+
+    def testApplyVoicing(self):
+        self.assertEqual(self.evaluations(lambda: self.ui.applyVoicing([0, 1, 0, 2, 3, MUTED])), 1)
+        self.assertEqual(self.evaluations(lambda: self.ui.applyVoicing([3, 3, 4, 5, 5, 3])), 1)
+
+    def testReset(self):
+        self.ui.applyVoicing([3, 3, 4, 5, 5, 3])
+        self.assertEqual(self.evaluations(self.ui.resetEvent), 1)
+
+    def testClick(self):
+        self.assertEqual(self.evaluations(lambda: self.ui.pointPressEventHelper(self.ui.strings[0][1].point)), 1)
+
+    def testUndoRedo(self):
+        self.ui.pointPressEventHelper(self.ui.strings[0][1].point)
+        self.assertEqual(self.evaluations(self.ui.undoEvent), 1)
+        self.assertEqual(self.evaluations(self.ui.redoEvent), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+'''
+    Rendering cache of the rich text shown in text browsers.
+'''
+from collections import OrderedDict
+from PyQt5 import QtGui, QtWidgets
+from instrumentation import tracer
+
+def richText(s: str):
+    '''
+        The HTML document of a centered bold text.
+    '''
+    return ("<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
+        "<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
+        "p, li { white-space: pre-wrap; }\n"
+        "</style></head><body style=\" font-family:\'PMingLiU\'; font-size:13pt; font-weight:400; font-style:normal;\">\n"
+        "<p align=\"center\" style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\">"
+        f"<span style=\" font-weight:600;\">{s}</span></p></body></html>")
+
+class DocumentCache:
+    '''
+        Bounded LRU of parsed documents of one text browser, keyed by what they show.
+
+        Showing a cached key swaps its document in without parsing HTML,
+        and showing the key already shown does nothing.
+    '''
+    def __init__(self, textBrowser: QtWidgets.QTextBrowser, capacity: int):
+        self.textBrowser = textBrowser
+        self.capacity = capacity
+        self.documents = OrderedDict()
+        self.current = None
+        self.hits = 0
+        self.misses = 0
+
+    def show(self, key, html):
+        '''
+            Show the document of key, parsed from html() only when it is not cached.
+        '''
+        if key == self.current:
+            self.hits += 1
+            return
+        document = self.documents.get(key)
+        if document is None:
+            self.misses += 1
+            document = QtGui.QTextDocument(self.textBrowser)    # Owned by the browser, not its text control
+            document.setDefaultFont(self.textBrowser.font())
+            self.textBrowser.setDocument(document)      # Laid out to the width of the browser when parsed
+            with tracer.span('setHtml'):
+                document.setHtml(html())
+            self.documents[key] = document
+            if len(self.documents) > self.capacity:
+                _, evicted = self.documents.popitem(last=False)
+                evicted.deleteLater()
+        else:
+            self.hits += 1
+            self.documents.move_to_end(key)
+            self.textBrowser.setDocument(document)
+        self.current = key
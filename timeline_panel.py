@@ -0,0 +1,84 @@
+'''
+    A dock panel listing the chords of a song with their key and roman numeral, beside the fretboard.
+'''
+from PyQt5 import QtCore, QtGui, QtWidgets
+from key_analysis import KeyTimeline, keyName, NO_KEY, PITCH_CLASS_NUM
+
+TIMELINE_COLUMNS = ('Chord', 'Key', 'Roman')
+## Background of the first chord of every key region
+KEY_CHANGE_COLOR = QtGui.QColor(255, 236, 179)
+
+class TimelineModel(QtCore.QAbstractTableModel):
+    '''
+        The rows of a KeyTimeline, only the rows shown are read by the view.
+    '''
+    def __init__(self, timeline: KeyTimeline, parent = None):
+        super().__init__(parent)
+        self.timeline = timeline
+
+    def rowCount(self, parent = QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.timeline)
+
+    def columnCount(self, parent = QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(TIMELINE_COLUMNS)
+
+    def headerData(self, section, orientation, role = QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        return TIMELINE_COLUMNS[section] if orientation == QtCore.Qt.Horizontal else str(section + 1)
+
+    def data(self, index, role = QtCore.Qt.DisplayRole):
+        row = index.row()
+        if role == QtCore.Qt.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return self.timeline.chordName(row)
+            if column == 1:
+                return keyName(self.timeline.key(row))
+            return self.timeline.numerals[row]
+        if role == QtCore.Qt.BackgroundRole and self.timeline.key(row) != NO_KEY:
+            if row == 0 or self.timeline.key(row - 1) != self.timeline.key(row):
+                return KEY_CHANGE_COLOR
+        return None
+
+    def extend(self, chordNames):
+        '''
+            Append chords as new rows, and refresh the earlier rows they re-keyed.
+        '''
+        if not chordNames:
+            return
+        start = len(self.timeline)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(chordNames) - 1)
+        first = self.timeline.extend(chordNames)
+        self.endInsertRows()
+        if first < start:
+            self.dataChanged.emit(self.index(first, 0), self.index(start - 1, len(TIMELINE_COLUMNS) - 1))
+
+class TimelinePanel(QtWidgets.QDockWidget):
+    '''
+        The chord timeline of a window, following the last chord appended.
+        Clicking a chord emits the (root pitch class, scale name) of its key.
+    '''
+    keySelected = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, parent = None):
+        super().__init__('Timeline', parent)
+        self.setObjectName('timelinePanel')
+        self.model = TimelineModel(KeyTimeline(), self)
+        self.view = QtWidgets.QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)       # No row measuring on long songs
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.clicked.connect(self.rowClicked)
+        self.setWidget(self.view)
+
+    def extend(self, chordNames):
+        self.model.extend(list(chordNames))
+        self.view.scrollToBottom()
+
+    def rowClicked(self, index):
+        key = self.model.timeline.key(index.row())
+        if key != NO_KEY:
+            self.keySelected.emit(key % PITCH_CLASS_NUM, 'minor' if key >= PITCH_CLASS_NUM else 'major')
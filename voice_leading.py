@@ -0,0 +1,144 @@
+'''
+    Voicings of a chord progression with the least hand movement, without Qt.
+
+    Every chord gets its playable voicings on the fretboard, and dynamic programming over
+    the voicing graph picks the sequence of least hand movement and fret span.
+
+    Usage: python voice_leading.py C Am F G
+'''
+import sys
+import time
+from functools import lru_cache
+import numpy as np
+from chord_analyzer import MUTED
+from chord_formula import getChordFormulaTable, FLAT_NOTES
+from chord_table import PITCH_CLASS_NUM
+from voicing_enumerator import formatVoicing
+from pitch import OPEN_STRING_PITCH
+from const import *
+
+HAND_SPAN = 4       # Frets the hand covers
+MIN_STRINGS = 3
+MAX_CANDIDATES = 256        # Easiest voicings kept per chord
+CANDIDATE_CACHE_SIZE = 128      # Chords whose voicings are memoized
+
+## Cost weights: movement of the hand position, strings changing fret, fret span and hand position of a voicing
+MOVE_WEIGHT = 1.0
+CHANGE_WEIGHT = 0.5
+SPAN_WEIGHT = 0.5
+POSITION_WEIGHT = 0.1
+
+def chordPitchClasses(chordName: str):
+    '''
+        The (pitch-class mask, bass pitch class) of a chord name, raise ValueError for unknown chord.
+    '''
+    formula = getChordFormulaTable().lookup(chordName)
+    if formula is None:
+        raise ValueError(f'Unknown chord "{chordName}"')
+    notes, mask = formula
+    return mask, NOTES.index(FLAT_NOTES.get(notes[0], notes[0]))
+
+@lru_cache(maxsize=CANDIDATE_CACHE_SIZE)
+def chordCandidates(chordName: str, frets: int = NOTE_PER_STRING, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        The (K, STRING_NUM) playable voicings of a chord on tuning (open string pitch from string one), easiest first: every chord tone sounding,
+        the bass as the lowest pitch, sounding strings adjacent and pressed frets in the hand span.
+    '''
+    mask, bass = chordPitchClasses(chordName)
+    open_pitch = np.array(tuning)
+    open_pitch_class = open_pitch % PITCH_CLASS_NUM
+    groups = []
+    for position in range(1, max(1, frets - HAND_SPAN + 1) + 1):
+        ## Muted, open, or a chord tone inside the hand at this position, for each string
+        options = []
+        for open_pc in open_pitch_class:
+            frets_here = [fret for fret in range(position, min(position + HAND_SPAN, frets + 1))
+                          if mask >> (open_pc + fret) % PITCH_CLASS_NUM & 1]
+            options.append([MUTED] + ([0] if mask >> open_pc & 1 else []) + frets_here)
+        grid = np.meshgrid(*[np.array(option, dtype=np.int8) for option in options], indexing='ij')
+        groups.append(np.stack(grid, axis=-1).reshape(-1, STRING_NUM))
+    voicings = np.concatenate(groups)
+
+    sounding = voicings != MUTED
+    pitch_classes = np.where(sounding, (open_pitch_class + voicings) % PITCH_CLASS_NUM, 0)
+    masks = np.bitwise_or.reduce(np.where(sounding, 1 << pitch_classes, 0), axis=1)
+    lowest = STRING_NUM - 1 - np.argmax(sounding[:, ::-1], axis=1)
+    highest = np.argmax(sounding, axis=1)
+    string_num = sounding.sum(axis=1)
+    bass_pitch = np.where(sounding, open_pitch + voicings, np.iinfo(np.int16).max).min(axis=1)
+    keep = (masks == mask) & (bass_pitch % PITCH_CLASS_NUM == bass)
+    keep &= (string_num >= MIN_STRINGS) & (lowest - highest + 1 == string_num)      # No muted string inside
+    voicings, string_num = voicings[keep], string_num[keep]
+    ## Hand positions overlap, drop the voicings found at several positions
+    keys = ((voicings.astype(np.int64) + 1) << (np.arange(STRING_NUM) * 5)).sum(axis=1)
+    _, unique = np.unique(keys, return_index=True)
+    voicings, string_num = voicings[unique], string_num[unique]
+
+    order = np.lexsort((handPosition(voicings), -string_num, fretSpan(voicings)))
+    voicings = voicings[order[:MAX_CANDIDATES]]
+    voicings.flags.writeable = False        # Shared by the cache
+    return voicings
+
+def handPosition(voicings):
+    '''
+        Mean pressed fret of each voicing, 0 if nothing is pressed.
+    '''
+    pressed = voicings > 0
+    return np.where(pressed, voicings, 0).sum(axis=-1) / np.maximum(pressed.sum(axis=-1), 1)
+
+def fretSpan(voicings):
+    '''
+        Distance between the highest and the lowest pressed fret of each voicing.
+    '''
+    pressed = voicings > 0
+    highest = np.where(pressed, voicings, 0).max(axis=-1)
+    lowest = np.where(pressed, voicings, NOTE_PER_STRING + 1).min(axis=-1)
+    return np.where(pressed.any(axis=-1), highest.astype(int) - lowest, 0)
+
+def voicingCost(voicings):
+    '''
+        The cost of holding each voicing.
+    '''
+    return SPAN_WEIGHT * fretSpan(voicings) + POSITION_WEIGHT * handPosition(voicings)
+
+def transitionCost(before, after):
+    '''
+        The (len(before), len(after)) cost of moving between every pair of voicings.
+    '''
+    move = np.abs(handPosition(before)[:, None] - handPosition(after)[None, :])
+    changes = (before[:, None, :] != after[None, :, :]).sum(axis=2)
+    return MOVE_WEIGHT * move + CHANGE_WEIGHT * changes
+
+def voiceLead(chordNames: list, frets: int = NOTE_PER_STRING, tuning: tuple = OPEN_STRING_PITCH):
+    '''
+        The voicing of every chord of a progression on tuning minimizing the total cost, and the cost.
+    '''
+    if not chordNames:
+        return [], 0.0
+    candidates = [chordCandidates(name.strip(), frets, tuple(tuning)) for name in chordNames]
+    for name, voicings in zip(chordNames, candidates):
+        if not len(voicings):
+            raise ValueError(f'No playable voicing of "{name}"')
+    cost = voicingCost(candidates[0])
+    back = []
+    for before, after in zip(candidates, candidates[1:]):
+        total = cost[:, None] + transitionCost(before, after)
+        back.append(np.argmin(total, axis=0))
+        cost = total[back[-1], np.arange(len(after))] + voicingCost(after)
+    idx = int(np.argmin(cost))
+    best = cost[idx]
+    path = [idx]
+    for pointers in reversed(back):
+        idx = int(pointers[idx])
+        path.append(idx)
+    path.reverse()
+    return [candidates[i][idx].tolist() for i, idx in enumerate(path)], float(best)
+
+if __name__ == '__main__':
+    chordNames = sys.argv[1:] or sys.stdin.read().split()
+    start = time.perf_counter()
+    voicings, cost = voiceLead(chordNames)
+    elapsed = time.perf_counter() - start
+    for name, voicing in zip(chordNames, voicings):
+        print(f'{name:<8}{formatVoicing(voicing)}')
+    print(f'cost {cost:.1f}, {elapsed * 1e3:.1f} ms', file=sys.stderr)
@@ -0,0 +1,125 @@
+'''
+    Enumerate every playable voicing on the fretboard and index them by chord name.
+
+    Usage: python voicing_enumerator.py [--span 4] [--min-strings 3] [--frets 22] [--workers N]
+                                        [--output index.npz] [--chord C ...]
+'''
+import os
+import time
+import argparse
+import itertools
+import numpy as np
+from multiprocessing import Pool
+from chord_analyzer import identifyBatch, MUTED
+from const import *
+
+## Frets of the strings enumerated inside a block, the two lowest strings are fixed per block
+BLOCK_STRING_NUM = STRING_NUM - 2
+_block_frets = dict()
+
+def blockFrets(frets: int):
+    '''
+        All fret combinations of the strings inside a block, from string one.
+    '''
+    if frets not in _block_frets:
+        values = range(MUTED, frets + 1)
+        _block_frets[frets] = np.array(list(itertools.product(values, repeat=BLOCK_STRING_NUM)), dtype=np.int8)
+    return _block_frets[frets]
+
+def isPlayable(frets: list, span: int):
+    '''
+        Whether the pressed (not open, not muted) frets are inside the hand span.
+    '''
+    pressed = [fret for fret in frets if fret > 0]
+    return not pressed or max(pressed) - min(pressed) < span
+
+def enumerateBlock(args):
+    '''
+        Enumerate the voicings with the fixed frets of string five and six.
+        Return the chord names, the voicings grouped by chord name, the count of each chord
+        and the number of states searched.
+    '''
+    fret_5, fret_6, span, min_strings, frets = args
+    rest = blockFrets(frets)
+    voicings = np.empty((len(rest), STRING_NUM), dtype=np.int8)
+    voicings[:, :BLOCK_STRING_NUM] = rest
+    voicings[:, STRING_NUM - 2] = fret_5
+    voicings[:, STRING_NUM - 1] = fret_6
+
+    pressed = voicings > 0
+    highest = np.where(pressed, voicings, 0).max(axis=1)
+    lowest = np.where(pressed, voicings, frets + 1).min(axis=1)
+    keep = ~pressed.any(axis=1) | (highest.astype(int) - lowest < span)
+    keep &= (voicings != MUTED).sum(axis=1) >= min_strings
+    voicings = voicings[keep]
+
+    chords = identifyBatch(voicings)
+    named = chords != ''
+    voicings, chords = voicings[named], chords[named].astype(str)
+    names, inverse, counts = np.unique(chords, return_inverse=True, return_counts=True)
+    return names, voicings[np.argsort(inverse, kind='stable')], counts, len(rest)
+
+def enumerateVoicings(span = 4, min_strings = 3, frets = NOTE_PER_STRING, workers = None):
+    '''
+        Enumerate the voicings of the whole fretboard on a process pool.
+        Return the index from chord name to an (K, STRING_NUM) array of voicings,
+        and the number of states searched.
+    '''
+    ## Blocks whose two fixed strings are already out of the hand span are pruned
+    blocks = [(fret_5, fret_6, span, min_strings, frets)
+              for fret_6 in range(MUTED, frets + 1) for fret_5 in range(MUTED, frets + 1)
+              if isPlayable([fret_5, fret_6], span)]
+    parts = dict()
+    searched = 0
+    with Pool(workers or os.cpu_count()) as pool:
+        for names, voicings, counts, states in pool.imap_unordered(enumerateBlock, blocks, chunksize=4):
+            searched += states
+            for name, group in zip(names, np.split(voicings, np.cumsum(counts)[:-1])):
+                parts.setdefault(name, []).append(group)
+    index = {name: np.concatenate(groups) for name, groups in parts.items()}
+    return index, searched
+
+def saveIndex(index: dict, path):
+    '''
+        Save the chord index as one voicing array sorted by chord name, and the offset of each chord.
+    '''
+    names = sorted(index)
+    counts = [len(index[name]) for name in names]
+    voicings = np.concatenate([index[name] for name in names]) if names else np.empty((0, STRING_NUM), dtype=np.int8)
+    np.savez_compressed(path, names=np.array(names), offsets=np.cumsum([0] + counts), voicings=voicings)
+
+def loadIndex(path):
+    '''
+        Load the chord index saved by saveIndex().
+    '''
+    data = np.load(path)
+    offsets = data['offsets']
+    return {str(name): data['voicings'][offsets[i]:offsets[i + 1]] for i, name in enumerate(data['names'])}
+
+def formatVoicing(voicing):
+    '''
+        Write a voicing from string six to string one, e.g. "x 3 2 0 1 0".
+    '''
+    return ' '.join('x' if fret == MUTED else str(fret) for fret in reversed(voicing))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Enumerate the voicings of every chord.')
+    parser.add_argument('--span', type=int, default=4, help='frets the hand can cover')
+    parser.add_argument('--min-strings', type=int, default=3, help='minimum number of sounding strings')
+    parser.add_argument('--frets', type=int, default=NOTE_PER_STRING, help='highest fret to search')
+    parser.add_argument('--workers', type=int, default=None, help='processes, default to the number of cores')
+    parser.add_argument('--output', default=None, help='save the chord index to this .npz file')
+    parser.add_argument('--chord', nargs='*', default=[], help='print the voicings of these chords')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index, searched = enumerateVoicings(args.span, args.min_strings, args.frets, args.workers)
+    elapsed = time.perf_counter() - start
+    space = (args.frets + 2) ** STRING_NUM
+    print(f'{searched} of {space} states searched in {elapsed:.2f} s ({searched / elapsed:,.0f} voicings/s), '
+          f'{sum(map(len, index.values()))} voicings of {len(index)} chords')
+    if args.output:
+        saveIndex(index, args.output)
+    for chord in args.chord:
+        for voicing in index.get(chord, []):
+            print(chord, formatVoicing(voicing))
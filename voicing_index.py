@@ -0,0 +1,149 @@
+'''
+    Memory-mapped on-disk index between chords and voicings.
+
+    File layout, all little-endian:
+        header      magic, version, string number, fret number, open string pitches, record counts
+        names       sorted fixed-width chord names
+        starts      first voicing of each chord
+        counts      voicing count of each chord
+        voicings    STRING_NUM int8 frets per voicing, grouped by chord in the order of the names
+        keys        sorted voicing keys
+        chords      chord name number of each key
+
+    Each section is a contiguous fixed-width array, and lookups binary-search the
+    memory-mapped sections, so only the touched pages are read.
+
+    Usage: python voicing_index.py build index.bin [--span 4] [--min-strings 3]
+           python voicing_index.py query index.bin C "x 3 2 0 1 0" ...
+'''
+import mmap
+import time
+import struct
+import argparse
+import numpy as np
+from chord_analyzer import parseVoicing, MUTED
+from pitch import OPEN_STRING_PITCH
+from const import *
+
+MAGIC = b'TNIX'
+VERSION = 2      # 2: named by the lowest pitch as bass, with add2 / add4
+NAME_WIDTH = 16
+HEADER = struct.Struct(f'<4sHBB{STRING_NUM}BII')
+FRET_BASE = NOTE_PER_STRING + 2     # Frets from MUTED to NOTE_PER_STRING
+
+## Open string pitches in MIDI number, from string one, identify the tuning of an index
+TUNING = OPEN_STRING_PITCH
+
+def voicingKeys(voicings):
+    '''
+        Pack each voicing of an (N, STRING_NUM) array into one integer.
+    '''
+    voicings = np.asarray(voicings, dtype=np.int64) - MUTED
+    return (voicings * FRET_BASE ** np.arange(STRING_NUM)).sum(axis=-1).astype('<u4')
+
+def writeIndex(index: dict, path):
+    '''
+        Write the index from chord name to (K, STRING_NUM) voicing array, made by voicing_enumerator.
+    '''
+    names = sorted(index)
+    for name in names:
+        if len(name.encode()) > NAME_WIDTH:
+            raise ValueError(f'Chord name "{name}" is longer than {NAME_WIDTH} bytes')
+    counts = np.array([len(index[name]) for name in names], dtype='<u4')
+    starts = (np.cumsum(counts) - counts).astype('<u4')
+    voicings = np.concatenate([index[name] for name in names]).astype(np.int8) if names else np.empty((0, STRING_NUM), dtype=np.int8)
+
+    keys = voicingKeys(voicings)
+    order = np.argsort(keys, kind='stable')
+    chords = np.repeat(np.arange(len(names), dtype='<u4'), counts)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, STRING_NUM, NOTE_PER_STRING, *TUNING, len(names), len(voicings)))
+        for section in (np.array(names, dtype=f'S{NAME_WIDTH}'), starts, counts, voicings, keys[order], chords[order]):
+            f.write(section.tobytes())
+
+class VoicingIndex:
+    '''
+        Read-only view of an index file, opened with mmap.
+    '''
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, string_num, fret_num, *rest = HEADER.unpack_from(self.mmap)
+        tuning, (chord_num, voicing_num) = tuple(rest[:-2]), rest[-2:]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} voicing index')
+        if (string_num, fret_num, tuning) != (STRING_NUM, NOTE_PER_STRING, TUNING):
+            raise ValueError(f'{path} is built for another fretboard, rebuild it for the tuning in const.py')
+
+        self.offset = HEADER.size
+        self.names = self.section(f'S{NAME_WIDTH}', chord_num)
+        self.starts = self.section('<u4', chord_num)
+        self.counts = self.section('<u4', chord_num)
+        self.voicings = self.section(np.int8, voicing_num * STRING_NUM).reshape(-1, STRING_NUM)
+        self.keys = self.section('<u4', voicing_num)
+        self.chords = self.section('<u4', voicing_num)
+
+    def section(self, dtype, count):
+        '''
+            Map the next section of the file as an array.
+        '''
+        array = np.frombuffer(self.mmap, dtype=dtype, count=count, offset=self.offset)
+        self.offset += array.nbytes
+        return array
+
+    def __len__(self):
+        return len(self.voicings)
+
+    def chordNames(self):
+        '''
+            All chord names in the index.
+        '''
+        return [name.decode() for name in self.names]
+
+    def voicingsOf(self, chordName: str):
+        '''
+            The (K, STRING_NUM) voicings of chord "chordName", without copying them out of the file.
+        '''
+        name = chordName.encode()
+        idx = np.searchsorted(self.names, name)
+        if idx == len(self.names) or self.names[idx] != name:
+            return self.voicings[:0]
+        return self.voicings[self.starts[idx]:self.starts[idx] + self.counts[idx]]
+
+    def chordOf(self, voicing):
+        '''
+            The chord name of a voicing, '' if the voicing is not in the index.
+        '''
+        key = voicingKeys(voicing)
+        idx = np.searchsorted(self.keys, key)
+        if idx == len(self.keys) or self.keys[idx] != key:
+            return ''
+        return self.names[self.chords[idx]].decode()
+
+    def close(self):
+        self.names = self.starts = self.counts = self.voicings = self.keys = self.chords = None
+        self.mmap.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build or query a voicing index.')
+    parser.add_argument('command', choices=['build', 'query'])
+    parser.add_argument('path')
+    parser.add_argument('queries', nargs='*', help='chord names or voicings to look up')
+    parser.add_argument('--span', type=int, default=4, help='frets the hand can cover')
+    parser.add_argument('--min-strings', type=int, default=3, help='minimum number of sounding strings')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from voicing_enumerator import enumerateVoicings
+        index, _ = enumerateVoicings(args.span, args.min_strings)
+        writeIndex(index, args.path)
+    else:
+        index = VoicingIndex(args.path)
+        for query in args.queries:
+            start = time.perf_counter()
+            try:
+                result = index.chordOf(parseVoicing(query))
+            except ValueError:
+                result = len(index.voicingsOf(query))
+            print(f'{query}: {result} ({(time.perf_counter() - start) * 1e6:.1f} us)')